@@ -0,0 +1,66 @@
+"""Import-time guard for the headless scanner.
+
+Imports each headless entry module in a fresh interpreter with
+``python -X importtime`` and fails if it pulls in GUI or exporter modules,
+or if its cumulative import time exceeds the budget.
+
+    python bench_import.py [--budget-ms 50] [--runs 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+HEADLESS_MODULES = ('scanner', 'migration_scanner')
+
+# Modules that only the GUI, an export or an opt-in scan stage should load
+LAZY_MODULES = {'tkinter', '_tkinter', 'gui', 'csv', 'exporters', 'snapshot', 'remediation', 'metadata'}
+
+
+def measure(module: str):
+    """Return (cumulative import time in ms, set of imported module names)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    total_us = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imported.add(name.strip())
+        if name.strip() == module and not name[1:].startswith(' '):
+            total_us = int(cumulative)
+    return total_us / 1000, imported
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=50.0)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    for module in HEADLESS_MODULES:
+        runs = [measure(module) for _ in range(args.runs)]
+        best_ms = min(ms for ms, _ in runs)
+        leaked = sorted(set.union(*(imported for _, imported in runs)) & LAZY_MODULES)
+
+        status = 'ok'
+        if leaked:
+            status = f"FAIL: imports {', '.join(leaked)}"
+            failed = True
+        elif best_ms > args.budget_ms:
+            status = f"FAIL: over {args.budget_ms:.0f} ms budget"
+            failed = True
+        print(f"{module:20} {best_ms:7.1f} ms  {status}")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import re
+from typing import Iterable, List, Pattern
+
+# Folders that are almost never migrated; offered as a starting point in the GUI
+COMMON_EXCLUSIONS = [
+    '.git',
+    'node_modules',
+    '~snapshot',
+    '.snapshot',
+    '$RECYCLE.BIN',
+    'System Volume Information',
+    '*.bak',
+]
+
+REGEX_PREFIX = 're:'
+
+
+def _translate_glob(pattern: str) -> str:
+    """Translate a glob to a regex where '*' and '?' stop at '/' and '**' does not"""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+            continue
+        if c == '*':
+            parts.append('[^/]*')
+        elif c == '?':
+            parts.append('[^/]')
+        elif c == '[':
+            end = pattern.find(']', i + 2)
+            if end == -1:
+                parts.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end].replace('\\', '\\\\')
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                parts.append(f'[{body}]')
+                i = end
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return ''.join(parts)
+
+
+class ExclusionMatcher:
+    """Compiles exclusion patterns into regexes over relative paths.
+
+    Patterns are globs unless prefixed with ``re:``. A glob without '/'
+    matches an entry name at any depth (``node_modules``, ``*.bak``); a glob
+    with '/' matches the whole path relative to the scan root
+    (``Archive/2019*``). Regex patterns are searched in the relative path.
+    Matching is case-insensitive, like the file systems being migrated.
+
+    Globs are joined into one regex. Regex patterns are compiled on their
+    own, so inline flags and group references keep their meaning.
+    """
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        self.patterns: List[str] = [p.strip() for p in patterns if p and p.strip()]
+        globs = []
+        self._regexes: List[Pattern] = []
+        for pattern in self.patterns:
+            if pattern.startswith(REGEX_PREFIX):
+                self._regexes.append(_compile(pattern[len(REGEX_PREFIX):], pattern))
+            elif '/' in pattern:
+                globs.append(f'(?:\\A{_translate_glob(pattern.strip("/"))}\\Z)')
+            else:
+                globs.append(f'(?:(?:\\A|/){_translate_glob(pattern)}\\Z)')
+        if globs:
+            self._regexes.insert(0, _compile('|'.join(globs), ', '.join(
+                p for p in self.patterns if not p.startswith(REGEX_PREFIX)
+            )))
+
+    def __bool__(self) -> bool:
+        return bool(self._regexes)
+
+    def matches(self, rel_path: str) -> bool:
+        """Check a '/'-separated path relative to the scan root"""
+        return any(regex.search(rel_path) is not None for regex in self._regexes)
+
+
+def _compile(regex: str, pattern: str) -> Pattern:
+    try:
+        return re.compile(regex, re.IGNORECASE)
+    except re.error as e:
+        raise ValueError(f"Invalid exclusion pattern '{pattern}': {e}")
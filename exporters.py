@@ -0,0 +1,32 @@
+import csv
+from typing import Dict, Iterable, Mapping, Sequence
+
+from result_store import REPORT_ERRORS
+
+CSV_HEADER = ['Name', 'Path', 'Issue', 'Suggested Fix']
+ROLLUP_HEADER = ['Rollup', 'Name', 'Files', 'Bytes']
+
+
+def write_csv(records: Iterable[Dict], filename: str) -> int:
+    """Write result records to a CSV file and return the number of rows"""
+    count = 0
+    with open(filename, 'w', newline='', encoding='utf-8', errors=REPORT_ERRORS) as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        for record in records:
+            writer.writerow([record['name'], record['path'], record['issue'], record['suggested_fix']])
+            count += 1
+    return count
+
+
+def write_rollups(rollups: Mapping[str, Mapping[str, Sequence[int]]], filename: str) -> int:
+    """Write metadata rollups ({rollup: {name: [files, bytes]}}) to a CSV file and return the number of rows"""
+    count = 0
+    with open(filename, 'w', newline='', encoding='utf-8', errors=REPORT_ERRORS) as f:
+        writer = csv.writer(f)
+        writer.writerow(ROLLUP_HEADER)
+        for rollup, totals in rollups.items():
+            for name, (files, size) in totals.items():
+                writer.writerow([rollup, name, files, size])
+                count += 1
+    return count
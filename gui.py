@@ -1,8 +1,89 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
-import csv
 from typing import List, Dict
+import threading
 import webbrowser
+from exclusions import COMMON_EXCLUSIONS
+from links import LINK_POLICIES
+from profiles import load_profiles, get_profile
+from result_index import ResultIndex
+
+class VirtualResultsView:
+    """Shows a window of a large result sequence in a Treeview.
+
+    Only the rows that fit on screen are inserted into the widget; rows are
+    fetched from the backing sequence by index as the user scrolls, so the
+    sequence may be a spilled ResultBuffer with millions of entries.
+    """
+
+    def __init__(self, tree: ttk.Treeview, scrollbar: ttk.Scrollbar):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.rows = []
+        self.offset = 0
+        self.visible_count = 20
+
+        self.scrollbar.configure(command=self.on_scrollbar)
+        self.tree.bind('<Configure>', self.on_resize)
+        self.tree.bind('<MouseWheel>', lambda e: self.scroll(int(-1 * (e.delta / 120)) * 3))
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(3))
+        self.tree.bind('<Prior>', lambda e: self.scroll(-self.visible_count))
+        self.tree.bind('<Next>', lambda e: self.scroll(self.visible_count))
+
+    def set_rows(self, rows) -> None:
+        self.rows = rows
+        self.offset = 0
+        self.refresh()
+
+    def row_height(self) -> int:
+        """Current Treeview row height; styles may change it after the view is created"""
+        try:
+            return int(ttk.Style().lookup('Treeview', 'rowheight')) or 25
+        except (ValueError, tk.TclError):
+            return 25
+
+    def on_resize(self, event) -> None:
+        # Leave room for the heading row
+        visible_count = max(1, event.height // self.row_height() - 1)
+        if visible_count != self.visible_count:
+            self.visible_count = visible_count
+            self.refresh()
+
+    def on_scrollbar(self, action, *args) -> None:
+        if action == 'moveto':
+            self.offset = int(float(args[0]) * len(self.rows))
+            self.refresh()
+        elif action == 'scroll':
+            step = int(args[0])
+            if args[1] == 'pages':
+                step *= self.visible_count
+            self.scroll(step)
+
+    def scroll(self, step: int) -> str:
+        self.offset += step
+        self.refresh()
+        return 'break'
+
+    def refresh(self) -> None:
+        total = len(self.rows)
+        self.offset = max(0, min(self.offset, total - self.visible_count))
+
+        self.tree.delete(*self.tree.get_children())
+        end = min(total, self.offset + self.visible_count)
+        for index in range(self.offset, end):
+            issue = self.rows[index]
+            self.tree.insert('', tk.END, values=(
+                issue['name'],
+                issue['path'],
+                issue['issue'],
+                issue['suggested_fix']
+            ))
+
+        if total:
+            self.scrollbar.set(self.offset / total, end / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
 
 class ScannerGUI:
     def __init__(self, root: tk.Tk, scanner):
@@ -151,6 +232,27 @@ class ScannerGUI:
         )
         self.issues_count_label.pack(side=tk.LEFT, padx=15, pady=5)
 
+        self.excluded_label = ttk.Label(
+            inner_stats_frame,
+            text="🚫 Excluded: 0",
+            style='Stats.TLabel'
+        )
+        self.excluded_label.pack(side=tk.LEFT, padx=15, pady=5)
+
+        self.links_label = ttk.Label(
+            inner_stats_frame,
+            text="🔗 Link Issues: 0",
+            style='Stats.TLabel'
+        )
+        self.links_label.pack(side=tk.LEFT, padx=15, pady=5)
+
+        self.metadata_label = ttk.Label(
+            inner_stats_frame,
+            text="🕒 Metadata: off",
+            style='Stats.TLabel'
+        )
+        self.metadata_label.pack(side=tk.LEFT, padx=15, pady=5)
+
         # Control panel
         control_frame = ttk.Frame(self.main_frame, style='TFrame')
         control_frame.pack(fill=tk.X, pady=(0, 15))
@@ -173,6 +275,64 @@ class ScannerGUI:
         )
         self.manage_ext_btn.pack(side=tk.LEFT, padx=5)
 
+        self.exclusions_btn = ttk.Button(
+            control_frame,
+            text="🚫 Exclusions",
+            command=self.manage_exclusions,
+            style='Secondary.TButton'
+        )
+        self.exclusions_btn.pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(
+            control_frame,
+            text="🔗 Links:",
+            style='Path.TLabel'
+        ).pack(side=tk.LEFT, padx=(10, 0))
+
+        self.link_policy_var = tk.StringVar(value=self.scanner.link_policy)
+        link_policy_box = ttk.Combobox(
+            control_frame,
+            textvariable=self.link_policy_var,
+            values=LINK_POLICIES,
+            state='readonly',
+            width=8
+        )
+        link_policy_box.pack(side=tk.LEFT, padx=5)
+        link_policy_box.bind(
+            '<<ComboboxSelected>>',
+            lambda e: self.scanner.set_link_policy(self.link_policy_var.get())
+        )
+
+        self.metadata_var = tk.BooleanVar(value=self.scanner.collect_metadata)
+        ttk.Checkbutton(
+            control_frame,
+            text="🕒 Owners & Ages",
+            variable=self.metadata_var,
+            command=lambda: self.scanner.set_metadata_collection(self.metadata_var.get(), self.scanner.stale_days)
+        ).pack(side=tk.LEFT, padx=(10, 0))
+
+        ttk.Label(
+            control_frame,
+            text="🎯 Profile:",
+            style='Path.TLabel'
+        ).pack(side=tk.LEFT, padx=(10, 0))
+
+        self.profile_var = tk.StringVar(value=self.scanner.rules.name)
+        try:
+            profile_names = list(load_profiles())
+        except ValueError as e:
+            messagebox.showerror("Invalid config.json", str(e))
+            profile_names = [self.scanner.rules.name]
+        profile_box = ttk.Combobox(
+            control_frame,
+            textvariable=self.profile_var,
+            values=profile_names,
+            state='readonly',
+            width=18
+        )
+        profile_box.pack(side=tk.LEFT, padx=5)
+        profile_box.bind('<<ComboboxSelected>>', lambda e: self.change_profile())
+
         self.export_btn = ttk.Button(
             control_frame,
             text="📥 Export Results",
@@ -181,15 +341,92 @@ class ScannerGUI:
         )
         self.export_btn.pack(side=tk.LEFT, padx=5)
 
+        self.open_results_btn = ttk.Button(
+            control_frame,
+            text="📂 Open Results",
+            command=self.open_results,
+            style='Secondary.TButton'
+        )
+        self.open_results_btn.pack(side=tk.LEFT, padx=5)
+
+        self.fix_btn = ttk.Button(
+            control_frame,
+            text="🛠 Apply Fixes",
+            command=self.apply_fixes,
+            style='Secondary.TButton'
+        )
+        self.fix_btn.pack(side=tk.LEFT, padx=5)
+
+        self.undo_fix_btn = ttk.Button(
+            control_frame,
+            text="↩ Undo Fixes",
+            command=self.undo_fixes,
+            style='Secondary.TButton'
+        )
+        self.undo_fix_btn.pack(side=tk.LEFT, padx=5)
+
+        self.snapshot_btn = ttk.Button(
+            control_frame,
+            text="💾 Save Snapshot",
+            command=self.save_snapshot,
+            style='Secondary.TButton'
+        )
+        self.snapshot_btn.pack(side=tk.LEFT, padx=5)
+
+        self.compare_btn = ttk.Button(
+            control_frame,
+            text="🔀 Compare Snapshots",
+            command=self.compare_snapshots,
+            style='Secondary.TButton'
+        )
+        self.compare_btn.pack(side=tk.LEFT, padx=5)
+
         # Results section
         results_frame = ttk.Frame(self.main_frame, style='TFrame')
         results_frame.pack(fill=tk.BOTH, expand=True)
 
+        results_header = ttk.Frame(results_frame, style='TFrame')
+        results_header.pack(fill=tk.X, pady=(0, 10))
+
         ttk.Label(
-            results_frame,
+            results_header,
             text="Scan Results",
             style='Header.TLabel'
-        ).pack(anchor=tk.W, pady=(0, 10))
+        ).pack(side=tk.LEFT)
+
+        # Links and exclusions are reported separately from migration issues
+        self.result_set_var = tk.StringVar(value='Issues')
+        result_set_box = ttk.Combobox(
+            results_header,
+            textvariable=self.result_set_var,
+            values=('Issues', 'Link Issues', 'Excluded', 'Metadata'),
+            state='readonly',
+            width=12
+        )
+        result_set_box.pack(side=tk.LEFT, padx=10)
+        result_set_box.bind('<<ComboboxSelected>>', lambda e: self.show_result_set())
+
+        ttk.Label(
+            results_header,
+            text="🔍",
+            style='Path.TLabel'
+        ).pack(side=tk.LEFT, padx=(10, 0))
+
+        self.search_var = tk.StringVar()
+        self.search_var.trace('w', self.on_search_changed)
+        self.search_after_id = None
+        ttk.Entry(
+            results_header,
+            textvariable=self.search_var,
+            width=40
+        ).pack(side=tk.LEFT, padx=5)
+
+        self.showing_label = ttk.Label(
+            results_header,
+            text="",
+            style='Path.TLabel'
+        )
+        self.showing_label.pack(side=tk.RIGHT)
 
         self.create_treeview(results_frame)
 
@@ -214,11 +451,21 @@ class ScannerGUI:
             style="Treeview"
         )
 
-        # Define headings
-        self.tree.heading('name', text='Name')
-        self.tree.heading('path', text='Path')
-        self.tree.heading('issue', text='Issue')
-        self.tree.heading('suggested_fix', text='Suggested Fix')
+        # Define headings; clicking one sorts the results by that column
+        self.column_titles = {
+            'name': 'Name',
+            'path': 'Path',
+            'issue': 'Issue',
+            'suggested_fix': 'Suggested Fix'
+        }
+        for column, title in self.column_titles.items():
+            self.tree.heading(column, text=title, command=lambda c=column: self.sort_by(c))
+        self.sort_field = None
+        self.sort_reverse = False
+        self.result_index = None
+        self.results_rows = []
+        self.index_generation = 0
+        self.results_reader = None  # Open binary result file, if one is shown
 
         # Define column widths
         self.tree.column('name', width=150)
@@ -226,11 +473,10 @@ class ScannerGUI:
         self.tree.column('issue', width=200)
         self.tree.column('suggested_fix', width=200)
 
-        # Add scrollbars
+        # Add scrollbars; the vertical one scrolls the virtual view, not the widget
         y_scrollbar = ttk.Scrollbar(
             tree_frame,
-            orient=tk.VERTICAL,
-            command=self.tree.yview
+            orient=tk.VERTICAL
         )
         x_scrollbar = ttk.Scrollbar(
             tree_frame,
@@ -238,27 +484,26 @@ class ScannerGUI:
             command=self.tree.xview
         )
         
-        self.tree.configure(
-            yscrollcommand=y_scrollbar.set,
-            xscrollcommand=x_scrollbar.set
-        )
+        self.tree.configure(xscrollcommand=x_scrollbar.set)
+        self.results_view = VirtualResultsView(self.tree, y_scrollbar)
 
         # Pack everything
-        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+        y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
     def scan_directory(self):
         directory = filedialog.askdirectory()
         if not directory:
             return
+        self.run_scan(directory)
 
+    def run_scan(self, directory: str, show_summary: bool = True):
         # Update current path label
         self.current_path_label.config(text=f"Scanning: {directory}")
 
         # Clear previous results
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.show_results([])
 
         # Perform scan
         issues = self.scanner.scan_directory(directory)
@@ -267,13 +512,8 @@ class ScannerGUI:
         self.current_path_label.config(text=f"Current Directory: {directory}")
         
         # Update results
-        for issue in issues:
-            self.tree.insert('', tk.END, values=(
-                issue['name'],
-                issue['path'],
-                issue['issue'],
-                issue['suggested_fix']
-            ))
+        self.result_set_var.set('Issues')
+        self.show_results(issues)
 
         # Update statistics
         self.total_files_label.config(
@@ -286,10 +526,11 @@ class ScannerGUI:
         self.score_label.config(
             text=f"Compliance Score: {score:.1f}%"
         )
+        self.update_excluded_label()
 
         # Show found extensions count
         found_extensions = self.scanner.get_found_extensions()
-        if found_extensions:
+        if found_extensions and show_summary:
             messagebox.showinfo(
                 "Scan Complete",
                 f"Found {len(found_extensions)} different file extensions.\n"
@@ -297,7 +538,7 @@ class ScannerGUI:
             )
 
     def export_results(self):
-        if not self.tree.get_children():
+        if not self.results_view.rows:
             messagebox.showwarning(
                 "No Data",
                 "No results to export. Please perform a scan first."
@@ -306,24 +547,380 @@ class ScannerGUI:
 
         filename = filedialog.asksaveasfilename(
             defaultextension='.csv',
-            filetypes=[("CSV files", "*.csv")]
+            filetypes=[("CSV files", "*.csv"), ("Scan results", "*.spr")]
         )
         
         if not filename:
             return
 
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Name', 'Path', 'Issue', 'Suggested Fix'])
-            
-            for item in self.tree.get_children():
-                writer.writerow(self.tree.item(item)['values'])
+        if filename.lower().endswith('.spr'):
+            from result_file import write_result_file
+
+            write_result_file(
+                self.results_view.rows,
+                filename,
+                self.scanner.total_files,
+                self.scanner.compliant_files,
+                self.scanner.get_current_directory()
+            )
+        else:
+            from exporters import write_csv
+
+            write_csv(self.results_view.rows, filename)
 
         messagebox.showinfo(
             "Success",
             f"Results exported to {filename}"
         ) 
 
+    def open_results(self):
+        from result_file import ResultFileReader
+
+        filename = filedialog.askopenfilename(
+            filetypes=[("Scan results", "*.spr")]
+        )
+        if not filename:
+            return
+
+        try:
+            reader = ResultFileReader(filename)
+        except ValueError as e:
+            messagebox.showerror("Invalid Results File", str(e))
+            return
+
+        # The reader maps the file, so records are only decoded as they are shown
+        if self.results_reader is not None:
+            self.results_reader.close()
+        self.results_reader = reader
+
+        self.current_path_label.config(
+            text=f"Results File: {filename} ({reader.directory or 'unknown directory'})"
+        )
+        self.show_results(reader)
+
+        if reader.total_files:
+            score = min(100.0, reader.compliant_files / reader.total_files * 100)
+        else:
+            score = 100.0
+        self.total_files_label.config(text=f"📄 Total Files: {reader.total_files}")
+        self.score_label.config(text=f"📊 Compliance Score: {score:.1f}%")
+        self.issues_count_label.config(text=f"⚠️ Issues Found: {len(reader)}")
+
+    def change_profile(self):
+        self.scanner.set_rules(get_profile(self.profile_var.get()))
+        directory = self.scanner.get_current_directory()
+        if directory:
+            self.run_scan(directory, show_summary=False)
+
+    def update_excluded_label(self):
+        self.excluded_label.config(
+            text=f"🚫 Excluded: {self.scanner.excluded_dirs} folders, "
+                 f"{self.scanner.excluded_files} files"
+        )
+        self.links_label.config(
+            text=f"🔗 Link Issues: {len(self.scanner.link_issues)}"
+        )
+        metadata = self.scanner.metadata
+        if metadata is None:
+            self.metadata_label.config(text="🕒 Metadata: off")
+        else:
+            self.metadata_label.config(
+                text=f"🕒 Stale: {metadata.stale_files}, "
+                     f"Unique Permissions: {metadata.unique_permissions}"
+            )
+
+    def show_result_set(self):
+        result_set = self.result_set_var.get()
+        if result_set == 'Link Issues':
+            self.show_results(self.scanner.link_issues)
+        elif result_set == 'Excluded':
+            self.show_results(self.scanner.excluded)
+        elif result_set == 'Metadata':
+            metadata = self.scanner.metadata
+            self.show_results(metadata.issues if metadata is not None else [])
+        else:
+            self.show_results(self.scanner.issues)
+
+    def show_results(self, rows):
+        """Display a result set and index it in the background for sorting and searching"""
+        self.results_rows = rows
+        self.result_index = None
+        self.index_generation += 1
+        self.sort_field = None
+        self.sort_reverse = False
+        self.update_headings()
+        self.results_view.set_rows(rows)
+        self.update_showing_label()
+
+        if not rows:
+            return
+        generation = self.index_generation
+        built = {}
+
+        def build_index():
+            try:
+                built['index'] = ResultIndex(rows)
+            except (OSError, ValueError) as e:
+                # The rows went away, e.g. their result file was closed
+                print(f"Indexing stopped: {e}")
+
+        thread = threading.Thread(target=build_index, daemon=True)
+        thread.start()
+        self.wait_for_index(thread, built, generation)
+
+    def wait_for_index(self, thread, built, generation):
+        if generation != self.index_generation:
+            return
+        if thread.is_alive():
+            self.root.after(100, self.wait_for_index, thread, built, generation)
+            return
+        self.result_index = built.get('index')
+        self.apply_view()
+
+    def apply_view(self):
+        if self.result_index is None:
+            return
+        self.results_view.set_rows(self.result_index.view(
+            self.search_var.get(),
+            self.sort_field,
+            self.sort_reverse
+        ))
+        self.update_showing_label()
+
+    def update_showing_label(self):
+        total = len(self.results_rows)
+        shown = len(self.results_view.rows)
+        if self.result_index is None and total:
+            self.showing_label.config(text=f"{total} rows (indexing...)")
+        elif shown != total:
+            self.showing_label.config(text=f"Showing {shown} of {total}")
+        else:
+            self.showing_label.config(text=f"{total} rows")
+
+    def update_headings(self):
+        for column, title in self.column_titles.items():
+            if column == self.sort_field:
+                title += ' ▼' if self.sort_reverse else ' ▲'
+            self.tree.heading(column, text=title)
+
+    def sort_by(self, column):
+        if self.sort_field == column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_field = column
+            self.sort_reverse = False
+        self.update_headings()
+        self.apply_view()
+
+    def on_search_changed(self, *args):
+        # Wait for a pause in typing before filtering
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(250, self.run_search)
+
+    def run_search(self):
+        self.search_after_id = None
+        self.apply_view()
+
+    def manage_exclusions(self):
+        dialog = ExclusionDialog(self.root, self.scanner)
+        self.root.wait_window(dialog)
+
+    def apply_fixes(self):
+        from remediation import build_rename_plan, check_plan
+
+        directory = self.scanner.get_current_directory()
+        if not directory:
+            messagebox.showwarning(
+                "No Directory Scanned",
+                "Please scan a directory first before applying fixes."
+            )
+            return
+
+        def plan_and_check(progress):
+            plan = build_rename_plan(self.scanner.issues, self.scanner.fix_name)
+            # Dry run: check the plan against the disk before anything is touched
+            return plan, check_plan(plan)
+
+        self.run_in_background(
+            "Planning renames...",
+            plan_and_check,
+            lambda result: self.confirm_fixes(directory, *result)
+        )
+
+    def confirm_fixes(self, directory: str, plan, check):
+        from remediation import apply_plan
+
+        if not plan:
+            messagebox.showinfo("No Fixes", "No items need to be renamed.")
+            return
+
+        preview = '\n'.join(f"{op.source}  →  {op.target}" for op in plan.ops[:10])
+        if len(plan) > 10:
+            preview += f"\n... and {len(plan) - 10} more"
+        warning = ''
+        if check.failed:
+            warning = f"\n\n{len(check.failed)} renames would fail, e.g. {check.failed[0][1]}"
+        if not messagebox.askyesno(
+            "Apply Fixes",
+            f"Rename {len(plan)} items ({len(plan.adjusted)} adjusted to avoid name collisions)?"
+            f"{warning}\n\n{preview}"
+        ):
+            return
+
+        journal_path = filedialog.asksaveasfilename(
+            title="Save undo journal",
+            defaultextension='.journal',
+            filetypes=[("Undo journals", "*.journal")]
+        )
+        if not journal_path:
+            return
+
+        def done(result):
+            self.run_scan(directory, show_summary=False)
+            self.show_remediation_result("Fixes Applied", "Renamed", result)
+
+        self.run_in_background(
+            f"Renaming {len(plan)} items...",
+            lambda progress: apply_plan(plan, journal_path, progress=progress),
+            done
+        )
+
+    def undo_fixes(self):
+        from remediation import rollback
+
+        journal_path = filedialog.askopenfilename(
+            title="Select undo journal",
+            filetypes=[("Undo journals", "*.journal")]
+        )
+        if not journal_path:
+            return
+
+        def done(result):
+            directory = self.scanner.get_current_directory()
+            if directory:
+                self.run_scan(directory, show_summary=False)
+            self.show_remediation_result("Fixes Undone", "Restored", result)
+
+        self.run_in_background(
+            "Restoring renamed items...",
+            lambda progress: rollback(journal_path, progress=progress),
+            done
+        )
+
+    def run_in_background(self, status: str, work, done):
+        """Run work(progress) on a worker thread and call done(result) when it finishes.
+
+        The window stays responsive and shows the progress count. The thread
+        is not a daemon, so closing the window cannot cut off a rename run.
+        """
+        outcome = {}
+
+        def progress(count: int):
+            outcome['progress'] = count
+
+        def target():
+            try:
+                outcome['result'] = work(progress)
+            except (OSError, ValueError) as e:
+                outcome['error'] = e
+
+        self.set_busy(True)
+        thread = threading.Thread(target=target)
+        thread.start()
+        self.wait_for_worker(thread, outcome, status, done)
+
+    def wait_for_worker(self, thread, outcome, status, done):
+        if thread.is_alive():
+            count = outcome.get('progress')
+            self.current_path_label.config(text=status if count is None else f"{status} {count} done")
+            self.root.after(100, self.wait_for_worker, thread, outcome, status, done)
+            return
+        self.set_busy(False)
+        directory = self.scanner.get_current_directory()
+        self.current_path_label.config(text=f"Current Directory: {directory}" if directory else "No directory selected")
+        if 'error' in outcome:
+            messagebox.showerror("Error", str(outcome['error']))
+        else:
+            done(outcome['result'])
+
+    def set_busy(self, busy: bool):
+        state = 'disabled' if busy else 'normal'
+        for button in (self.scan_btn, self.fix_btn, self.undo_fix_btn):
+            button.config(state=state)
+
+    def show_remediation_result(self, title: str, action: str, result):
+        message = f"{action} {result.renamed} items."
+        if result.failed:
+            message += f"\n\n{len(result.failed)} failed, for example:\n"
+            message += '\n'.join(f"{op.source}: {error}" for op, error in result.failed[:5])
+            messagebox.showwarning(title, message)
+        else:
+            messagebox.showinfo(title, message)
+
+    def save_snapshot(self):
+        if not self.scanner.get_current_directory():
+            messagebox.showwarning(
+                "No Directory Scanned",
+                "Please scan a directory first before saving a snapshot."
+            )
+            return
+
+        filename = filedialog.asksaveasfilename(
+            defaultextension='.spsnap',
+            filetypes=[("Scan snapshots", "*.spsnap")]
+        )
+        if not filename:
+            return
+
+        from snapshot import write_snapshot
+
+        count = write_snapshot(self.scanner.issues, filename)
+        messagebox.showinfo(
+            "Snapshot Saved",
+            f"Saved {count} issues to {filename}"
+        )
+
+    def compare_snapshots(self):
+        snapshot_types = [("Scan snapshots", "*.spsnap")]
+        old_filename = filedialog.askopenfilename(
+            title="Select the older snapshot",
+            filetypes=snapshot_types
+        )
+        if not old_filename:
+            return
+        new_filename = filedialog.askopenfilename(
+            title="Select the newer snapshot",
+            filetypes=snapshot_types
+        )
+        if not new_filename:
+            return
+        report_filename = filedialog.asksaveasfilename(
+            title="Save diff report",
+            defaultextension='.csv',
+            filetypes=[("CSV files", "*.csv")]
+        )
+        if not report_filename:
+            return
+
+        from result_store import REPORT_ERRORS
+        from snapshot import diff_snapshots, write_diff
+
+        try:
+            with open(report_filename, 'w', newline='', encoding='utf-8', errors=REPORT_ERRORS) as f:
+                counts = write_diff(diff_snapshots(old_filename, new_filename), f)
+        except ValueError as e:
+            messagebox.showerror("Invalid Snapshot", str(e))
+            return
+
+        messagebox.showinfo(
+            "Comparison Complete",
+            f"New issues: {counts['added']}\n"
+            f"Resolved issues: {counts['removed']}\n"
+            f"Changed issues: {counts['changed']}\n\n"
+            f"Report saved to {report_filename}"
+        )
+
     def manage_extensions(self):
         if not self.scanner.get_current_directory():
             messagebox.showwarning(
@@ -353,21 +950,12 @@ class ScannerGUI:
         if not hasattr(self.scanner, 'current_directory') or not self.scanner.current_directory:
             return
 
-        # Clear previous results
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
         # Get new filtered results
         issues = self.scanner.get_filtered_issues()
         
         # Update results in treeview
-        for issue in issues:
-            self.tree.insert('', tk.END, values=(
-                issue['name'],
-                issue['path'],
-                issue['issue'],
-                issue['suggested_fix']
-            ))
+        self.result_set_var.set('Issues')
+        self.show_results(issues)
 
         # Update statistics
         total_files = self.scanner.total_files
@@ -682,20 +1270,14 @@ class ExtensionManagerDialog(tk.Toplevel):
         # Rescan the current directory and update main window
         if self.scanner.current_directory:
             # Clear previous results
-            for item in self.main_gui.tree.get_children():
-                self.main_gui.tree.delete(item)
+            self.main_gui.show_results([])
 
             # Perform scan
             issues = self.scanner.scan_directory(self.scanner.current_directory)
             
             # Update results
-            for issue in issues:
-                self.main_gui.tree.insert('', tk.END, values=(
-                    issue['name'],
-                    issue['path'],
-                    issue['issue'],
-                    issue['suggested_fix']
-                ))
+            self.main_gui.result_set_var.set('Issues')
+            self.main_gui.show_results(issues)
 
             # Update statistics in main window
             self.main_gui.total_files_label.config(
@@ -708,6 +1290,7 @@ class ExtensionManagerDialog(tk.Toplevel):
             self.main_gui.score_label.config(
                 text=f"Compliance Score: {score:.1f}%"
             )
+            self.main_gui.update_excluded_label()
 
         messagebox.showinfo(
             "Changes Applied",
@@ -718,4 +1301,87 @@ class ExtensionManagerDialog(tk.Toplevel):
     def cancel_changes(self):
         # Restore original extension states
         self.scanner.unsupported_extensions = self.original_unsupported.copy()
-        self.destroy() 
\ No newline at end of file
+        self.destroy()
+
+class ExclusionDialog(tk.Toplevel):
+    def __init__(self, parent, scanner):
+        super().__init__(parent)
+        self.scanner = scanner
+
+        self.title("Exclusion Rules")
+        self.geometry("500x450")
+        self.transient(parent)
+        self.grab_set()
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        main_frame = ttk.Frame(self, padding="20", style='ExtManager.TFrame')
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        ttk.Label(
+            main_frame,
+            text="🚫 Exclusion Rules",
+            style='ExtManagerHeader.TLabel'
+        ).pack(anchor=tk.W)
+
+        ttk.Label(
+            main_frame,
+            text="One pattern per line. Names like node_modules or *.bak match at any depth,\n"
+                 "paths like Archive/2019* match from the scan root, re: starts a regex.\n"
+                 "Excluded folders are not scanned.",
+            style='ExtManager.TLabel'
+        ).pack(anchor=tk.W, pady=(0, 10))
+
+        self.text = tk.Text(main_frame, height=12, font=('Segoe UI', 10))
+        self.text.pack(fill=tk.BOTH, expand=True)
+        self.text.insert('1.0', '\n'.join(self.scanner.get_exclusions()))
+
+        btn_frame = ttk.Frame(main_frame, style='ExtManager.TFrame')
+        btn_frame.pack(fill=tk.X, pady=(15, 0))
+
+        ttk.Button(
+            btn_frame,
+            text="Add Common",
+            command=self.add_common,
+            style='ExtManager.TButton'
+        ).pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(
+            btn_frame,
+            text="Apply",
+            command=self.apply_changes,
+            style='ExtManager.TButton'
+        ).pack(side=tk.RIGHT, padx=5)
+
+        ttk.Button(
+            btn_frame,
+            text="Cancel",
+            command=self.destroy,
+            style='ExtManager.TButton'
+        ).pack(side=tk.RIGHT, padx=5)
+
+    def get_patterns(self):
+        return [line.strip() for line in self.text.get('1.0', tk.END).splitlines() if line.strip()]
+
+    def add_common(self):
+        patterns = self.get_patterns()
+        for pattern in COMMON_EXCLUSIONS:
+            if pattern not in patterns:
+                patterns.append(pattern)
+        self.text.delete('1.0', tk.END)
+        self.text.insert('1.0', '\n'.join(patterns))
+
+    def apply_changes(self):
+        try:
+            self.scanner.set_exclusions(self.get_patterns())
+        except ValueError as e:
+            messagebox.showerror("Invalid Pattern", str(e), parent=self)
+            return
+
+        messagebox.showinfo(
+            "Exclusions Updated",
+            "Exclusion rules will be applied on the next scan.",
+            parent=self
+        )
+        self.destroy()
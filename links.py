@@ -0,0 +1,100 @@
+import os
+import stat
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set
+
+# How symbolic links and junctions are handled during a scan
+LINK_FOLLOW = 'follow'  # Scan the link target; loops and repeats are detected by inode
+LINK_REPORT = 'report'  # Do not follow; list the link as a link issue
+LINK_SKIP = 'skip'      # Ignore links entirely
+LINK_POLICIES = (LINK_FOLLOW, LINK_REPORT, LINK_SKIP)
+
+# Pending inodes kept in a plain set before being packed into a sorted array
+_BUFFER_SIZE = 65536
+
+
+class _DeviceInodes:
+    """Inode numbers seen on one device, stored as sorted runs of uint64.
+
+    New inodes go into a small set; when it fills it is sorted into an
+    array and runs of similar size are merged, so each entry costs about
+    8 bytes and lookups are a few binary searches.
+    """
+
+    def __init__(self):
+        self.pending: Set[int] = set()
+        self.runs: List[array] = []
+
+    def __contains__(self, ino: int) -> bool:
+        if ino in self.pending:
+            return True
+        for run in self.runs:
+            i = bisect_left(run, ino)
+            if i < len(run) and run[i] == ino:
+                return True
+        return False
+
+    def add(self, ino: int) -> None:
+        self.pending.add(ino)
+        if len(self.pending) >= _BUFFER_SIZE:
+            self.runs.append(array('Q', sorted(self.pending)))
+            self.pending = set()
+            while len(self.runs) > 1 and len(self.runs[-2]) <= 2 * len(self.runs[-1]):
+                newest = self.runs.pop()
+                self.runs[-1] = array('Q', sorted(self.runs[-1] + newest))
+
+    def __len__(self) -> int:
+        return len(self.pending) + sum(len(run) for run in self.runs)
+
+
+class InodeSet:
+    """Compact set of (st_dev, st_ino) pairs"""
+
+    def __init__(self):
+        self._devices: Dict[int, _DeviceInodes] = {}
+
+    def add(self, dev: int, ino: int) -> bool:
+        """Add a pair; returns False if it was already present"""
+        inodes = self._devices.get(dev)
+        if inodes is None:
+            inodes = self._devices[dev] = _DeviceInodes()
+        elif ino in inodes:
+            return False
+        inodes.add(ino)
+        return True
+
+    def __len__(self) -> int:
+        return sum(len(inodes) for inodes in self._devices.values())
+
+
+def link_type(entry: os.DirEntry) -> Optional[str]:
+    """Return 'Symbolic link' or 'Junction' for link entries, None otherwise"""
+    try:
+        if entry.is_symlink():
+            return "Symbolic link"
+        if hasattr(entry, 'is_junction'):
+            return "Junction" if entry.is_junction() else None
+        if os.name == 'nt':
+            # Before Python 3.12 junctions only show up as reparse points
+            attributes = entry.stat(follow_symlinks=False).st_file_attributes
+            if attributes & stat.FILE_ATTRIBUTE_REPARSE_POINT:
+                return "Junction"
+    except OSError:
+        pass
+    return None
+
+
+def identity(entry: os.DirEntry, follow_symlinks: bool = False) -> Optional[os.stat_result]:
+    """Stat an entry with st_dev, st_ino and st_nlink filled in.
+
+    DirEntry.stat() reuses the directory listing where it can, but on
+    Windows it leaves those fields zero, so fall back to a full os.stat().
+    """
+    try:
+        st = entry.stat(follow_symlinks=follow_symlinks)
+        if st.st_ino == 0:
+            st = os.stat(entry.path, follow_symlinks=follow_symlinks)
+        return st
+    except OSError:
+        return None
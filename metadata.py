@@ -0,0 +1,236 @@
+"""Optional timestamp, owner and permission collection for migration planning.
+
+Ages, sizes and POSIX owners come from the stat result the directory walk
+already holds, so they cost no extra system calls. Lookups that do need
+them (POSIX ACL attributes, Windows security descriptors) are batched and
+run on a thread pool while the walk continues.
+"""
+import os
+import time
+from bisect import bisect_left
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from result_store import ResultBuffer, MemoryBudget
+
+_DAY = 86400
+
+# Upper bound in days of each age bucket, by last modification; the last has none
+AGE_BUCKETS = (
+    (30, "Under 30 days"),
+    (365, "30 days to 1 year"),
+    (3 * 365, "1 to 3 years"),
+    (None, "Over 3 years"),
+)
+_AGE_BOUNDS = [days for days, _ in AGE_BUCKETS[:-1]]
+
+# Files not modified for this many days are reported as stale
+DEFAULT_STALE_DAYS = 3 * 365
+
+# Items per lookup task, and tasks in flight before the walk waits for results
+BATCH_SIZE = 256
+MAX_PENDING_BATCHES = 64
+DEFAULT_WORKERS = 8
+
+UNKNOWN_OWNER = "Unknown"
+
+# Present only when an ACL has entries beyond the mode bits
+_POSIX_ACCESS_ACL = 'system.posix_acl_access'
+_POSIX_DEFAULT_ACL = 'system.posix_acl_default'
+
+
+@lru_cache(maxsize=None)
+def user_name(uid: int) -> str:
+    """Account name for a uid, or the number if it has none"""
+    try:
+        import pwd
+        return pwd.getpwuid(uid).pw_name
+    except (ImportError, KeyError):
+        return str(uid)
+
+
+@lru_cache(maxsize=None)
+def group_name(gid: int) -> str:
+    """Group name for a gid, or the number if it has none"""
+    try:
+        import grp
+        return grp.getgrgid(gid).gr_name
+    except (ImportError, KeyError):
+        return str(gid)
+
+
+def _has_xattr(path: str, attribute: str) -> bool:
+    try:
+        os.getxattr(path, attribute)
+    except OSError:
+        # No such attribute, or a file system without ACL support
+        return False
+    return True
+
+
+def _posix_lookup(path: str, is_dir: bool) -> Tuple[Optional[str], Optional[str]]:
+    if _has_xattr(path, _POSIX_ACCESS_ACL):
+        return None, "extended ACL"
+    if is_dir and _has_xattr(path, _POSIX_DEFAULT_ACL):
+        return None, "default ACL for contents"
+    return None, None
+
+
+@lru_cache(maxsize=None)
+def _account_name(sid: str) -> str:
+    import win32security
+
+    try:
+        name, domain, _ = win32security.LookupAccountSid(None, win32security.ConvertStringSidToSid(sid))
+    except win32security.error:
+        return sid
+    return f"{domain}\\{name}" if domain else name
+
+
+def _windows_lookup(path: str, is_dir: bool) -> Tuple[Optional[str], Optional[str]]:
+    import win32security
+
+    try:
+        descriptor = win32security.GetFileSecurity(
+            path,
+            win32security.OWNER_SECURITY_INFORMATION | win32security.DACL_SECURITY_INFORMATION
+        )
+    except win32security.error:
+        return None, None
+    owner = _account_name(win32security.ConvertSidToStringSid(descriptor.GetSecurityDescriptorOwner()))
+    control, _ = descriptor.GetSecurityDescriptorControl()
+    reason = "inheritance disabled" if control & win32security.SE_DACL_PROTECTED else None
+    return owner, reason
+
+
+def _permission_lookup():
+    """Per-item owner/ACL lookup for this platform, or None if there is none"""
+    if os.name == 'nt':
+        try:
+            import win32security  # noqa: F401 (pywin32 is optional)
+        except ImportError:
+            return None
+        return _windows_lookup
+    if hasattr(os, 'getxattr'):
+        return _posix_lookup
+    return None
+
+
+def _lookup_batch(lookup, items: List[Tuple]) -> List[Tuple[Optional[str], Optional[str]]]:
+    return [lookup(item[0], item[1]) for item in items]
+
+
+class MetadataCollector:
+    """Collects ages, owners and unique permissions of scanned items.
+
+    Stale files and items with unique permissions are added to ``issues``.
+    Files are rolled up by age bucket, owner and group as [files, bytes].
+    Call ``close`` after the walk to wait for outstanding lookups.
+    """
+
+    def __init__(self, budget: Optional[MemoryBudget] = None, stale_days: Optional[int] = None,
+                 check_permissions: bool = True, workers: int = DEFAULT_WORKERS, now: Optional[float] = None):
+        self.now = time.time() if now is None else now
+        self.stale_days = DEFAULT_STALE_DAYS if stale_days is None else stale_days
+        self.issues = ResultBuffer(budget=budget)
+        self.age_rollup: Dict[str, List[int]] = {label: [0, 0] for _, label in AGE_BUCKETS}
+        self.owner_rollup: Dict[str, List[int]] = {}
+        self.group_rollup: Dict[str, List[int]] = {}
+        self.stale_files = 0
+        self.unique_permissions = 0
+        self.workers = workers
+        self._lookup = _permission_lookup() if check_permissions else None
+        self._executor = None
+        self._batch: List[Tuple] = []
+        self._pending = deque()
+
+    def add(self, entry: os.DirEntry, is_dir: bool) -> None:
+        """Collect metadata for one entry of a directory listing"""
+        try:
+            st = entry.stat()
+        except OSError:
+            return
+
+        owner = group = None
+        if os.name != 'nt':
+            owner = user_name(st.st_uid)
+            group = group_name(st.st_gid)
+        if not is_dir:
+            self._add_age(entry, st.st_mtime, st.st_size)
+
+        item = (entry.path, is_dir, st.st_size, owner, group)
+        if self._lookup is None:
+            self._record(item, None, None)
+            return
+        self._batch.append(item)
+        if len(self._batch) >= BATCH_SIZE:
+            self._submit()
+
+    def _add_age(self, entry: os.DirEntry, mtime: float, size: int) -> None:
+        age_days = (self.now - mtime) / _DAY
+        bucket = self.age_rollup[AGE_BUCKETS[bisect_left(_AGE_BOUNDS, age_days)][1]]
+        bucket[0] += 1
+        bucket[1] += size
+        if age_days >= self.stale_days:
+            self.stale_files += 1
+            modified = time.strftime('%Y-%m-%d', time.localtime(mtime))
+            self.issues.append({
+                'name': entry.name,
+                'path': entry.path,
+                'issue': f"Not modified for {int(age_days)} days (last modified {modified})",
+                'suggested_fix': "Review for archiving instead of migrating"
+            })
+
+    def _submit(self) -> None:
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        batch, self._batch = self._batch, []
+        self._pending.append((batch, self._executor.submit(_lookup_batch, self._lookup, batch)))
+        # Bound the work held in memory; results are collected in submission order
+        while len(self._pending) > MAX_PENDING_BATCHES or (self._pending and self._pending[0][1].done()):
+            self._collect()
+
+    def _collect(self) -> None:
+        batch, future = self._pending.popleft()
+        for item, (owner, reason) in zip(batch, future.result()):
+            self._record(item, owner, reason)
+
+    def _record(self, item: Tuple, owner: Optional[str], reason: Optional[str]) -> None:
+        path, is_dir, size, stat_owner, group = item
+        if reason:
+            self.unique_permissions += 1
+            self.issues.append({
+                'name': os.path.basename(path),
+                'path': path,
+                'issue': f"Unique permissions ({reason})",
+                'suggested_fix': "Recreate the permissions in SharePoint or reset them before migrating"
+            })
+        if is_dir:
+            return
+        totals = self.owner_rollup.setdefault(owner or stat_owner or UNKNOWN_OWNER, [0, 0])
+        totals[0] += 1
+        totals[1] += size
+        if group is not None:
+            totals = self.group_rollup.setdefault(group, [0, 0])
+            totals[0] += 1
+            totals[1] += size
+
+    def close(self) -> None:
+        """Finish outstanding lookups and stop the worker threads"""
+        if self._batch:
+            self._submit()
+        while self._pending:
+            self._collect()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def rollups(self) -> Dict[str, Dict[str, List[int]]]:
+        """Age, owner and group rollups, each mapping a name to [files, bytes]"""
+        return {'Age': self.age_rollup, 'Owner': self.owner_rollup, 'Group': self.group_rollup}
+
+    def top_owners(self, count: int = 10) -> List[Tuple[str, List[int]]]:
+        """Owners with the most bytes, largest first"""
+        return sorted(self.owner_rollup.items(), key=lambda item: item[1][1], reverse=True)[:count]
@@ -1,25 +1,268 @@
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-import csv
+import argparse
+import sys
 from scanner import SharePointScanner
-from gui import ScannerGUI
+from result_store import DEFAULT_MEMORY_LIMIT, REPORT_ERRORS
+from links import LINK_POLICIES, LINK_REPORT
+from profiles import DEFAULT_CONFIG, load_profiles, get_profile, get_default_profile_name, default_rules
+
+# The GUI, exporters, snapshot and remediation modules are imported where they
+# are used, so headless runs never load tkinter or unrelated code
 
 def main():
+    import tkinter as tk
+    from tkinter import messagebox
+    from gui import ScannerGUI
+
     root = tk.Tk()
     root.title("SharePoint Migration Scanner")
     root.geometry("1024x768")
     root.configure(bg='#f0f0f0')
-    
+
     # Make the window resizable
     root.minsize(800, 600)
-    
-    scanner = SharePointScanner()
+
+    try:
+        rules = get_profile(get_default_profile_name())
+    except ValueError as e:
+        messagebox.showerror("Invalid config.json", f"{e}\n\nUsing the built-in defaults.")
+        rules = default_rules()
+
+    scanner = SharePointScanner(rules=rules)
     app = ScannerGUI(root, scanner)
-    
+
     # Bind the extension filter update to recalculate scores
     app.bind_extension_updates()
-    
+
     root.mainloop()
 
+def run_show(args) -> int:
+    import time
+    from exporters import write_csv
+    from result_file import ResultFileReader
+
+    reader = ResultFileReader(args.results)
+    try:
+        if args.csv:
+            count = write_csv(reader, args.csv)
+            print(f"{count} issues exported to {args.csv}")
+            return 0
+
+        print(f"Directory: {reader.directory or 'unknown'}")
+        print(f"Issues: {len(reader)}, Total files: {reader.total_files}, Compliant files: {reader.compliant_files}")
+        position = args.start
+        while True:
+            end = len(reader) if args.limit is None else min(len(reader), args.start + args.limit)
+            for index in range(position, end):
+                issue = reader[index]
+                print(f"{issue['path']}\t{issue['issue']}\t{issue['suggested_fix']}")
+            position = max(position, end)
+            if not args.follow:
+                return 0
+            time.sleep(1)
+            reader.refresh()
+    finally:
+        reader.close()
+
+def get_rules(args):
+    return get_profile(args.profile or get_default_profile_name(args.config), args.config)
+
+def run_scan(args) -> int:
+    from exporters import write_csv
+    from snapshot import write_snapshot
+
+    scanner = SharePointScanner(memory_limit=args.memory_limit * 1024 * 1024, rules=get_rules(args))
+    scanner.set_exclusions(args.exclude)
+    scanner.set_link_policy(args.links)
+    scanner.set_metadata_collection(
+        args.metadata or bool(args.metadata_csv or args.rollups_csv or args.stale_days),
+        args.stale_days
+    )
+
+    writer = None
+    if args.results:
+        from result_file import ResultFileWriter
+
+        # Stream issues as they are found so the file can be viewed during the scan
+        writer = ResultFileWriter(args.results, args.directory)
+        scanner.on_issue = writer.append
+    try:
+        issues = scanner.scan_directory(args.directory)
+    finally:
+        if writer:
+            writer.total_files = scanner.total_files
+            writer.compliant_files = scanner.compliant_files
+            writer.close()
+    if writer:
+        print(f"Results written to {args.results}")
+
+    if args.csv:
+        write_csv(issues, args.csv)
+        print(f"Results exported to {args.csv}")
+
+    if args.snapshot:
+        count = write_snapshot(issues, args.snapshot)
+        print(f"Snapshot with {count} issues written to {args.snapshot}")
+
+    if args.excluded_csv:
+        write_csv(scanner.excluded, args.excluded_csv)
+        print(f"Excluded entries exported to {args.excluded_csv}")
+
+    if args.links_csv:
+        write_csv(scanner.link_issues, args.links_csv)
+        print(f"Link issues exported to {args.links_csv}")
+
+    if args.metadata_csv:
+        write_csv(scanner.metadata.issues, args.metadata_csv)
+        print(f"Stale items and unique permissions exported to {args.metadata_csv}")
+
+    if args.rollups_csv:
+        from exporters import write_rollups
+
+        write_rollups(scanner.metadata.rollups(), args.rollups_csv)
+        print(f"Age, owner and group rollups exported to {args.rollups_csv}")
+
+    print(f"Compliance Score: {scanner.get_compliance_score():.1f}%")
+    return 0
+
+def run_diff(args) -> int:
+    from snapshot import diff_snapshots, write_diff
+
+    changes = diff_snapshots(args.old, args.new)
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8', errors=REPORT_ERRORS) as f:
+            counts = write_diff(changes, f)
+    else:
+        sys.stdout.reconfigure(errors=REPORT_ERRORS)
+        counts = write_diff(changes, sys.stdout)
+    print(
+        f"Added: {counts['added']}, Removed: {counts['removed']}, Changed: {counts['changed']}",
+        file=sys.stderr
+    )
+    return 0
+
+def run_fix(args) -> int:
+    from remediation import DEFAULT_WORKERS, build_rename_plan, apply_plan
+
+    scanner = SharePointScanner(rules=get_rules(args))
+    scanner.set_exclusions(args.exclude)
+    issues = scanner.scan_directory(args.directory)
+
+    plan = build_rename_plan(issues, scanner.fix_name)
+    for op in plan:
+        note = " (adjusted to avoid a name collision)" if op.adjusted else ""
+        print(f"{op.source} -> {op.target}{note}")
+    print(f"Planned renames: {len(plan)}, adjusted: {len(plan.adjusted)}")
+
+    if not plan:
+        return 0
+    if args.dry_run:
+        result = apply_plan(plan, dry_run=True)
+        for op, error in result.failed:
+            print(f"Would fail: {op.source}: {error}", file=sys.stderr)
+        return 1 if result.failed else 0
+    if not args.journal:
+        print("A --journal file is required to apply fixes", file=sys.stderr)
+        return 2
+
+    result = apply_plan(plan, args.journal, workers=args.workers or DEFAULT_WORKERS)
+    for op, error in result.failed:
+        print(f"Failed: {op.source}: {error}", file=sys.stderr)
+    return 1 if result.failed else 0
+
+def run_rollback(args) -> int:
+    from remediation import DEFAULT_WORKERS, rollback
+
+    result = rollback(args.journal, workers=args.workers or DEFAULT_WORKERS)
+    for op, error in result.failed:
+        print(f"Failed: {op.target}: {error}", file=sys.stderr)
+    return 1 if result.failed else 0
+
+def run_profiles(args) -> int:
+    default_name = get_default_profile_name(args.config)
+    for name, rules in load_profiles(args.config).items():
+        marker = '*' if name == default_name else ' '
+        print(
+            f"{marker} {name}: max path {rules.max_path_length}, "
+            f"invalid characters {rules.invalid_characters}, "
+            f"unsupported {' '.join(sorted(rules.unsupported_extensions))}"
+        )
+    return 0
+
+def cli(argv) -> int:
+    parser = argparse.ArgumentParser(
+        prog="migration_scanner",
+        description="SharePoint Migration Scanner. Run without arguments to start the GUI."
+    )
+    parser.add_argument('--config', default=DEFAULT_CONFIG, help="Scan profile configuration file")
+    parser.add_argument('--profile', help="Scan profile to use (default from the config file)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    scan_parser = subparsers.add_parser('scan', help="Scan a directory without the GUI")
+    scan_parser.add_argument('directory')
+    scan_parser.add_argument('--csv', help="Export issues to this CSV file")
+    scan_parser.add_argument('--snapshot', help="Save a snapshot for later comparison")
+    scan_parser.add_argument('--results', help="Stream issues to this binary result file")
+    scan_parser.add_argument(
+        '--exclude', action='append', default=[], metavar='PATTERN',
+        help="Skip entries matching a glob (or 're:' regex); may be repeated"
+    )
+    scan_parser.add_argument('--excluded-csv', help="Export excluded entries to this CSV file")
+    scan_parser.add_argument(
+        '--links', choices=LINK_POLICIES, default=LINK_REPORT,
+        help="Follow, report or skip symbolic links and junctions"
+    )
+    scan_parser.add_argument('--links-csv', help="Export link issues to this CSV file")
+    scan_parser.add_argument(
+        '--metadata', action='store_true',
+        help="Collect last-modified dates, owners and unique permissions"
+    )
+    scan_parser.add_argument('--stale-days', type=int, help="Report files not modified for this many days (default 1095)")
+    scan_parser.add_argument('--metadata-csv', help="Export stale items and unique permissions to this CSV file")
+    scan_parser.add_argument('--rollups-csv', help="Export age, owner and group rollups to this CSV file")
+    scan_parser.add_argument(
+        '--memory-limit', type=int, default=DEFAULT_MEMORY_LIMIT // (1024 * 1024),
+        help="MB of results kept in memory, across all result sets, before spilling to disk"
+    )
+    scan_parser.set_defaults(func=run_scan)
+
+    diff_parser = subparsers.add_parser('diff', help="Compare two snapshots")
+    diff_parser.add_argument('old')
+    diff_parser.add_argument('new')
+    diff_parser.add_argument('-o', '--output', help="Write the diff CSV here instead of stdout")
+    diff_parser.set_defaults(func=run_diff)
+
+    fix_parser = subparsers.add_parser('fix', help="Rename items with invalid characters")
+    fix_parser.add_argument('directory')
+    fix_parser.add_argument('--dry-run', action='store_true', help="Print the rename plan and check it without renaming")
+    fix_parser.add_argument('--journal', help="Record renames here so they can be rolled back")
+    fix_parser.add_argument('--workers', type=int, help="Parallel renames (default 8)")
+    fix_parser.add_argument('--exclude', action='append', default=[], metavar='PATTERN')
+    fix_parser.set_defaults(func=run_fix)
+
+    rollback_parser = subparsers.add_parser('rollback', help="Undo the renames recorded in a journal")
+    rollback_parser.add_argument('journal')
+    rollback_parser.add_argument('--workers', type=int, help="Parallel renames (default 8)")
+    rollback_parser.set_defaults(func=run_rollback)
+
+    show_parser = subparsers.add_parser('show', help="Print or export a binary result file")
+    show_parser.add_argument('results')
+    show_parser.add_argument('--start', type=int, default=0, help="Index of the first issue to print")
+    show_parser.add_argument('--limit', type=int, help="Maximum number of issues to print")
+    show_parser.add_argument('--follow', action='store_true', help="Keep printing issues as a running scan adds them")
+    show_parser.add_argument('--csv', help="Export all issues to this CSV file instead")
+    show_parser.set_defaults(func=run_show)
+
+    profiles_parser = subparsers.add_parser('profiles', help="List the available scan profiles")
+    profiles_parser.set_defaults(func=run_profiles)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    if len(sys.argv) > 1:
+        sys.exit(cli(sys.argv[1:]))
+    main()
@@ -0,0 +1,104 @@
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Tuple
+
+from profiles import RuleSet
+
+# Distinct names remembered; real trees repeat names like Thumbs.db and New Folder
+DEFAULT_CACHE_SIZE = 65536
+
+# Longest name most file systems and sync clients accept, in UTF-8 bytes
+MAX_NAME_BYTES = 255
+
+# Bytes left as-is when a path segment is URL-encoded (RFC 3986 unreserved and sub-delims)
+_URL_SAFE_BYTES = (
+    b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'
+    b"-._~!$&'()*+,;=@"
+)
+
+# Lone surrogates: U+DC80-U+DCFF come from undecodable bytes via os.fsdecode,
+# the rest from unpaired UTF-16 code units in Windows names
+_UNDECODABLE = re.compile('[\udc80-\udcff]')
+_SURROGATE = re.compile('[\ud800-\udfff]')
+
+INVALID_CHARACTERS = "Contains invalid characters"
+INVALID_AFTER_NFC = "Contains invalid characters after Unicode normalization"
+NOT_NFC = "Name is not in Unicode normalized form (NFC)"
+UNDECODABLE = "Name contains bytes that are not valid UTF-8"
+UNPAIRED_SURROGATE = "Name contains unpaired UTF-16 surrogates"
+NAME_TOO_LONG = f"Name exceeds {MAX_NAME_BYTES} bytes in UTF-8"
+
+# Name issues that a rename fixes
+RENAME_ISSUES = (INVALID_CHARACTERS, INVALID_AFTER_NFC, NOT_NFC, UNDECODABLE, UNPAIRED_SURROGATE, NAME_TOO_LONG)
+
+_SEPARATORS = {'/', os.sep}
+
+
+def encoded_length(text: str) -> int:
+    """Length of ``text`` once UTF-8 and percent-encoded for a URL"""
+    data = text.encode('utf-8', 'surrogatepass')
+    return len(data) + 2 * len(data.translate(None, _URL_SAFE_BYTES))
+
+
+def encoded_path_length(path: str) -> int:
+    """URL-encoded length of a path, leaving separators unescaped"""
+    return encoded_length(path) - 2 * sum(path.count(sep) for sep in _SEPARATORS)
+
+
+class NameValidator:
+    """Per-name checks for one rule set, memoized in a bounded LRU cache.
+
+    Only checks that depend on the name alone are cached; path lengths and
+    unsupported extensions, which can change between scans, stay with the
+    scanner.
+    """
+
+    def __init__(self, rules: RuleSet, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.rules = rules
+        self.check = lru_cache(maxsize=cache_size)(self._check)
+        self.fix_name = lru_cache(maxsize=cache_size)(self._fix_name)
+
+    def _check(self, name: str) -> Tuple[Tuple[str, ...], int]:
+        """Return (issues, URL-encoded length) for a file or folder name"""
+        issues = []
+        invalid = self.rules.invalid_pattern
+
+        if invalid.search(name):
+            issues.append(INVALID_CHARACTERS)
+
+        if _SURROGATE.search(name):
+            if _UNDECODABLE.search(name):
+                issues.append(UNDECODABLE)
+            else:
+                issues.append(UNPAIRED_SURROGATE)
+        elif not name.isascii():
+            normalized = unicodedata.normalize('NFC', name)
+            if normalized != name:
+                if INVALID_CHARACTERS not in issues and invalid.search(normalized):
+                    issues.append(INVALID_AFTER_NFC)
+                else:
+                    issues.append(NOT_NFC)
+
+        name_bytes = len(name.encode('utf-8', 'surrogatepass'))
+        if name_bytes > MAX_NAME_BYTES:
+            issues.append(NAME_TOO_LONG)
+
+        return tuple(issues), encoded_length(name)
+
+    def _fix_name(self, name: str) -> str:
+        """Return a name that passes the per-name checks"""
+        name = _SURROGATE.sub('_', name)
+        name = unicodedata.normalize('NFC', name)
+        name = self.rules.invalid_pattern.sub('_', name)
+        while len(name.encode('utf-8')) > MAX_NAME_BYTES:
+            stem, dot, ext = name.rpartition('.')
+            if not stem or len(ext) > 16:
+                name = name[:-1]
+            else:
+                name = f"{stem[:-1]}.{ext}"
+        return name
+
+    def cache_info(self):
+        return self.check.cache_info()
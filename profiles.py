@@ -0,0 +1,183 @@
+import os
+import re
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Mapping, NamedTuple, Optional, Pattern, Tuple
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+DEFAULT_PROFILE = 'SharePoint 2016'
+
+# Used when config.json is missing; profiles in config.json replace these by name
+BUILTIN_PROFILES = {
+    'SharePoint Online': {
+        'max_path_length': 400,
+        'invalid_characters': '"*:<>?/\\|',
+        'unsupported_extensions': ['.exe', '.bat', '.cmd', '.dll', '.vbs'],
+    },
+    'SharePoint 2016': {
+        'max_path_length': 260,
+        'invalid_characters': '~"#%&*:<>?/\\{|}',
+        'unsupported_extensions': ['.exe', '.bat', '.cmd', '.dll', '.vbs'],
+    },
+    'OneDrive': {
+        'max_path_length': 400,
+        'invalid_characters': '"*:<>?/\\|',
+        'unsupported_extensions': ['.exe', '.bat', '.cmd', '.dll', '.vbs'],
+    },
+}
+
+_PROFILE_KEYS = {
+    'max_path_length',
+    'max_encoded_path_length',
+    'invalid_characters',
+    'additional_invalid_characters',
+    'unsupported_extensions',
+    'additional_unsupported_extensions',
+}
+
+
+class RuleSet(NamedTuple):
+    """Compiled, immutable scan rules for one profile"""
+    name: str
+    max_path_length: int
+    max_encoded_path_length: Optional[int]  # Limit on the URL-encoded path; None means no check
+    invalid_characters: str
+    invalid_pattern: Pattern
+    unsupported_extensions: FrozenSet[str]
+    fingerprint: str  # Hash of the profile definition
+
+    def __reduce__(self):
+        # Workers rebuild through the compile cache instead of unpickling a new pattern
+        return (_rules_for, (self.name, self.max_path_length, self.max_encoded_path_length,
+                             self.invalid_characters, tuple(sorted(self.unsupported_extensions))))
+
+
+# Compiled rule sets by fingerprint and loaded config files by content hash,
+# shared by every scanner in the process
+_RULES: Dict[str, RuleSet] = {}
+# Invalid character pattern of profiles that allow every character
+_NEVER_MATCHES = re.compile(r'(?!)')
+_CONFIGS: Dict[str, Tuple[Mapping[str, RuleSet], str]] = {}
+
+
+def _normalize_extension(extension: str) -> str:
+    if not extension.startswith('.'):
+        extension = f'.{extension}'
+    return extension.lower()
+
+
+def _rules_for(name: str, max_path_length: int, max_encoded_path_length: Optional[int],
+               invalid_characters: str, extensions) -> RuleSet:
+    import hashlib
+    import json
+
+    extensions = frozenset(_normalize_extension(ext) for ext in extensions)
+    key = json.dumps([name, max_path_length, max_encoded_path_length, invalid_characters, sorted(extensions)])
+    fingerprint = hashlib.sha256(key.encode('utf-8')).hexdigest()
+    rules = _RULES.get(fingerprint)
+    if rules is None:
+        if invalid_characters:
+            pattern = re.compile('[' + ''.join(re.escape(c) for c in invalid_characters) + ']')
+        else:
+            pattern = _NEVER_MATCHES
+        rules = _RULES[fingerprint] = RuleSet(
+            name, max_path_length, max_encoded_path_length, invalid_characters, pattern,
+            extensions, fingerprint
+        )
+    return rules
+
+
+def compile_profile(name: str, spec: Mapping) -> RuleSet:
+    """Validate a profile definition and return its compiled rule set"""
+    if not isinstance(spec, Mapping):
+        raise ValueError(f"Profile '{name}' must be an object")
+    unknown = set(spec) - _PROFILE_KEYS
+    if unknown:
+        raise ValueError(f"Profile '{name}' has unknown settings: {', '.join(sorted(unknown))}")
+
+    max_path_length = spec.get('max_path_length', 260)
+    # SharePoint's path limits apply to the decoded path; the encoded limit is opt-in
+    max_encoded_path_length = spec.get('max_encoded_path_length')
+    for key, value in (('max_path_length', max_path_length),
+                       ('max_encoded_path_length', max_encoded_path_length)):
+        if value is None and key == 'max_encoded_path_length':
+            continue
+        if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+            raise ValueError(f"Profile '{name}': {key} must be a positive integer")
+
+    characters = ''
+    for key in ('invalid_characters', 'additional_invalid_characters'):
+        value = spec.get(key, '')
+        if not isinstance(value, str):
+            raise ValueError(f"Profile '{name}': {key} must be a string of characters")
+        characters += value
+    # Keep the first occurrence of each character, in order
+    characters = ''.join(dict.fromkeys(characters))
+
+    extensions = []
+    for key in ('unsupported_extensions', 'additional_unsupported_extensions'):
+        value = spec.get(key, [])
+        if not isinstance(value, list) or not all(isinstance(ext, str) and ext for ext in value):
+            raise ValueError(f"Profile '{name}': {key} must be a list of extensions")
+        extensions.extend(value)
+
+    return _rules_for(name, max_path_length, max_encoded_path_length, characters, extensions)
+
+
+def _load_config(path: str):
+    import hashlib
+    import json
+
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        data = b'{}'
+
+    content_hash = hashlib.sha256(data).hexdigest()
+    cached = _CONFIGS.get(content_hash)
+    if cached is not None:
+        return cached
+
+    try:
+        config = json.loads(data.decode('utf-8'))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"{path} is not valid JSON: {e}")
+    if not isinstance(config, dict) or not isinstance(config.get('profiles', {}), dict):
+        raise ValueError(f"{path} must contain a 'profiles' object")
+
+    specs = dict(BUILTIN_PROFILES)
+    specs.update(config.get('profiles', {}))
+    profiles = MappingProxyType({name: compile_profile(name, spec) for name, spec in specs.items()})
+    default_name = config.get('default_profile', DEFAULT_PROFILE)
+    if not isinstance(default_name, str) or default_name not in profiles:
+        raise ValueError(f"{path}: default_profile '{default_name}' is not defined")
+
+    _CONFIGS[content_hash] = (profiles, default_name)
+    return profiles, default_name
+
+
+def load_profiles(path: str = DEFAULT_CONFIG) -> Mapping[str, RuleSet]:
+    """Load named scan profiles from a config.json file.
+
+    Built-in profiles are included unless the file redefines them. Results
+    are cached by the file's content hash, so loading an unchanged file again
+    only costs a read and a hash.
+    """
+    return _load_config(path)[0]
+
+
+def get_default_profile_name(path: str = DEFAULT_CONFIG) -> str:
+    """Return the profile named by 'default_profile' in config.json"""
+    return _load_config(path)[1]
+
+
+def get_profile(name: str, path: str = DEFAULT_CONFIG) -> RuleSet:
+    profiles = load_profiles(path)
+    if name not in profiles:
+        raise ValueError(f"Unknown scan profile: {name}")
+    return profiles[name]
+
+
+def default_rules() -> RuleSet:
+    """Rules of the built-in default profile, without reading config.json"""
+    return compile_profile(DEFAULT_PROFILE, BUILTIN_PROFILES[DEFAULT_PROFILE])
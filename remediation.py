@@ -0,0 +1,271 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+DEFAULT_WORKERS = 8
+JOURNAL_VERSION = 1
+
+
+class RenameOp(NamedTuple):
+    source: str
+    target: str
+    depth: int
+    adjusted: bool  # Target got a numbered suffix to avoid a name collision
+
+
+class RenamePlan:
+    """Renames ordered so that children are renamed before their parents"""
+
+    def __init__(self, ops: List[RenameOp]):
+        self.ops = sorted(ops, key=lambda op: -op.depth)
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def __iter__(self):
+        return iter(self.ops)
+
+    @property
+    def adjusted(self) -> List[RenameOp]:
+        return [op for op in self.ops if op.adjusted]
+
+    def levels(self) -> Iterable[List[RenameOp]]:
+        """Groups of renames at the same depth, deepest first; each group is independent"""
+        for _, ops in groupby(self.ops, key=lambda op: op.depth):
+            yield list(ops)
+
+
+class RemediationResult(NamedTuple):
+    renamed: int
+    failed: List[Tuple[RenameOp, str]]
+    dry_run: bool
+
+
+def _key(name: str) -> str:
+    # SharePoint and Windows file names are case-insensitive
+    return name.casefold()
+
+
+def _unique_name(name: str, taken: Dict[str, str]) -> str:
+    stem, ext = os.path.splitext(name)
+    counter = 2
+    while True:
+        candidate = f"{stem} ({counter}){ext}"
+        if _key(candidate) not in taken:
+            return candidate
+        counter += 1
+
+
+def build_rename_plan(issues: Iterable[Dict], fix_name: Callable[[str], str]) -> RenamePlan:
+    """Turn scan issues into a collision-free rename plan.
+
+    Each parent directory gets a name index of its current entries plus the
+    targets already planned in it. Names being renamed away stay in the
+    index, so no target can reuse a name that still exists while the plan
+    runs; colliding targets get a numbered suffix instead.
+    """
+    indexes: Dict[str, Dict[str, str]] = {}
+    ops = []
+    seen = set()
+    for issue in issues:
+        path = issue['path']
+        name = os.path.basename(path)
+        target_name = fix_name(name)
+        if target_name == name or path in seen:
+            continue
+        seen.add(path)
+
+        parent = os.path.dirname(path)
+        index = indexes.get(parent)
+        if index is None:
+            try:
+                index = {_key(entry): entry for entry in os.listdir(parent)}
+            except OSError:
+                continue
+            indexes[parent] = index
+
+        adjusted = _key(target_name) in index
+        if adjusted:
+            target_name = _unique_name(target_name, index)
+        index[_key(target_name)] = target_name
+
+        depth = path.count(os.sep) + (path.count(os.altsep) if os.altsep else 0)
+        ops.append(RenameOp(path, os.path.join(parent, target_name), depth, adjusted))
+    return RenamePlan(ops)
+
+
+class _Journal:
+    """Write-ahead JSON lines log of renames, flushed per entry.
+
+    Each rename is logged before it is attempted and marked if it fails, so
+    a run that is interrupted between the two can still be rolled back.
+    """
+
+    def __init__(self, filename: str, plan_size: int):
+        self._lock = threading.Lock()
+        self._file = open(filename, 'w', encoding='utf-8')
+        self._write({'journal': JOURNAL_VERSION, 'planned': plan_size})
+
+    def _write(self, entry: Dict) -> None:
+        # ensure_ascii escapes lone surrogates from undecodable file names
+        self._file.write(json.dumps(entry) + '\n')
+        self._file.flush()
+
+    def intent(self, op: RenameOp) -> None:
+        with self._lock:
+            self._write({'source': op.source, 'target': op.target, 'depth': op.depth})
+
+    def failed(self, op: RenameOp) -> None:
+        with self._lock:
+            self._write({'failed': op.source})
+
+    def close(self) -> None:
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+
+def _rename(source: str, target: str) -> None:
+    # os.rename silently replaces existing files on POSIX
+    if os.path.lexists(target):
+        raise FileExistsError(f"Target already exists: {target}")
+    os.rename(source, target)
+
+
+def check_plan(plan: RenamePlan) -> RemediationResult:
+    """Verify a rename plan against the file system without renaming anything.
+
+    Renames are simulated level by level in the order apply_plan runs them:
+    each source must exist and each target must be free at that point.
+    Returns how many renames would succeed and which would fail.
+    """
+    created = set()
+    removed = set()
+
+    def exists(path: str) -> bool:
+        if path in created:
+            return True
+        return path not in removed and os.path.lexists(path)
+
+    renamed = 0
+    failed = []
+    for level in plan.levels():
+        for op in level:
+            if not exists(op.source):
+                failed.append((op, f"Source does not exist: {op.source}"))
+            elif exists(op.target):
+                failed.append((op, f"Target already exists: {op.target}"))
+            else:
+                created.discard(op.source)
+                removed.add(op.source)
+                created.add(op.target)
+                renamed += 1
+
+    print(f"Dry run complete. Would rename: {renamed}, Would fail: {len(failed)}")
+    return RemediationResult(renamed, failed, True)
+
+
+def apply_plan(plan: RenamePlan, journal_path: Optional[str] = None,
+               workers: int = DEFAULT_WORKERS, dry_run: bool = False,
+               progress: Optional[Callable[[int], None]] = None) -> RemediationResult:
+    """Apply a rename plan with a bounded worker pool.
+
+    Renames at the same depth run in parallel; each depth finishes before
+    the next shallower one starts, so parents are renamed after their
+    children. Every completed rename is journaled so it can be rolled back.
+    With ``dry_run`` the plan is only verified, see check_plan. ``progress``
+    is called with the number of renames finished so far.
+    """
+    if dry_run:
+        return check_plan(plan)
+
+    journal = _Journal(journal_path, len(plan)) if journal_path else None
+    renamed = 0
+    failed = []
+
+    def run(op: RenameOp):
+        if journal:
+            journal.intent(op)
+        try:
+            _rename(op.source, op.target)
+        except OSError as e:
+            if journal:
+                journal.failed(op)
+            return op, str(e)
+        return op, None
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for level in plan.levels():
+                for op, error in executor.map(run, level):
+                    if error:
+                        failed.append((op, error))
+                    else:
+                        renamed += 1
+                    if progress is not None:
+                        progress(renamed + len(failed))
+    finally:
+        if journal:
+            journal.close()
+
+    print(f"Remediation complete. Renamed: {renamed}, Failed: {len(failed)}")
+    return RemediationResult(renamed, failed, False)
+
+
+def read_journal(journal_path: str) -> List[RenameOp]:
+    """Return the renames recorded in a journal, leaving out those that failed"""
+    ops = []
+    failed = set()
+    with open(journal_path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                break  # Torn final line from an interrupted run
+            if 'source' in entry:
+                ops.append(RenameOp(entry['source'], entry['target'], entry['depth'], False))
+            elif 'failed' in entry:
+                failed.add(entry['failed'])
+    return [op for op in ops if op.source not in failed]
+
+
+def rollback(journal_path: str, workers: int = DEFAULT_WORKERS,
+             progress: Optional[Callable[[int], None]] = None) -> RemediationResult:
+    """Undo the renames recorded in a journal.
+
+    Parents are restored before their children, since the journaled child
+    paths use the parents' original names. ``progress`` is called with the
+    number of journal entries handled so far.
+    """
+    handled = 0
+    renamed = 0
+    failed = []
+
+    def run(op: RenameOp):
+        if not os.path.lexists(op.target) and os.path.lexists(op.source):
+            return op, False  # Logged but never applied, e.g. the run was interrupted
+        try:
+            _rename(op.target, op.source)
+        except OSError as e:
+            return op, str(e)
+        return op, None
+
+    ops = sorted(read_journal(journal_path), key=lambda op: op.depth)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _, level in groupby(ops, key=lambda op: op.depth):
+            for op, error in executor.map(run, list(level)):
+                if error:
+                    failed.append((op, error))
+                elif error is None:
+                    renamed += 1
+                handled += 1
+                if progress is not None:
+                    progress(handled)
+
+    print(f"Rollback complete. Restored: {renamed}, Failed: {len(failed)}")
+    return RemediationResult(renamed, failed, False)
@@ -0,0 +1,258 @@
+"""Binary scan result files.
+
+Layout, all integers little-endian::
+
+    header   magic, committed length, total files, compliant files,
+             offset of the scanned directory string (0 if none)
+    blocks   a string block followed by a record block, appended per commit
+
+A string block holds length-prefixed UTF-8 strings. A string is referred
+to by the file offset of its length prefix, so no string index is needed.
+A record block holds fixed-width records of four string offsets (name,
+path, issue, suggested fix). Repeated names, issues and fixes are interned
+and stored once.
+
+The writer appends whole blocks and only then advances the committed length
+in the header, so a reader in another process can map the file at any time
+and see complete records up to that length. Blocks are committed every
+COMMIT_EVERY records and at least every COMMIT_INTERVAL seconds, so a
+slow trickle of issues still shows up promptly.
+"""
+import mmap
+import os
+import struct
+import threading
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional
+
+from result_store import RESULT_FIELDS, STRING_ERRORS
+
+MAGIC = b'SPRF\x01\x00\x00\x00'
+_HEADER = struct.Struct('<8sQQQQ')
+_BLOCK = struct.Struct('<4sIQ')
+_RECORD = struct.Struct('<' + 'Q' * len(RESULT_FIELDS))
+_LENGTH = struct.Struct('<I')
+_STRINGS = b'STR\x00'
+_RECORDS = b'REC\x00'
+
+# Records buffered before a commit makes them visible to readers
+COMMIT_EVERY = 4096
+# Longest time in seconds a record waits before readers can see it
+COMMIT_INTERVAL = 1.0
+# Fields worth interning; paths are unique so they are always written out
+_INTERNED_FIELDS = ('name', 'issue', 'suggested_fix')
+_INTERN_LIMIT = 100000
+
+
+class ResultFileWriter:
+    """Appends issue records to a binary result file.
+
+    With a ``commit_interval``, a background thread commits pending records
+    on that schedule; pass None when nobody reads the file while it is written.
+    """
+
+    def __init__(self, filename: str, directory: Optional[str] = None,
+                 commit_interval: Optional[float] = COMMIT_INTERVAL):
+        self._lock = threading.Lock()
+        self._file = open(filename, 'wb')
+        self._file.write(_HEADER.pack(MAGIC, _HEADER.size, 0, 0, 0))
+        self._end = _HEADER.size
+        self._strings: List[bytes] = []
+        self._strings_size = 0
+        self._records: List[bytes] = []
+        self._interned: Dict[str, int] = {}
+        self._directory_offset = self._add_string(directory) if directory else 0
+        self.total_files = 0
+        self.compliant_files = 0
+        self._commit()
+
+        self._closing = threading.Event()
+        self._committer = None
+        if commit_interval:
+            self._committer = threading.Thread(
+                target=self._commit_periodically, args=(commit_interval,), daemon=True
+            )
+            self._committer.start()
+
+    def _commit_periodically(self, interval: float) -> None:
+        while not self._closing.wait(interval):
+            with self._lock:
+                if self._records and not self._file.closed:
+                    self._commit()
+
+    def _add_string(self, value: str) -> int:
+        data = value.encode('utf-8', STRING_ERRORS)
+        offset = self._end + _BLOCK.size + self._strings_size
+        self._strings.append(_LENGTH.pack(len(data)))
+        self._strings.append(data)
+        self._strings_size += _LENGTH.size + len(data)
+        return offset
+
+    def _string(self, field: str, value: str) -> int:
+        if field not in _INTERNED_FIELDS:
+            return self._add_string(value)
+        offset = self._interned.get(value)
+        if offset is None:
+            if len(self._interned) >= _INTERN_LIMIT:
+                self._interned.clear()
+            offset = self._interned[value] = self._add_string(value)
+        return offset
+
+    def append(self, record: Dict) -> None:
+        with self._lock:
+            self._records.append(_RECORD.pack(*(self._string(field, record[field]) for field in RESULT_FIELDS)))
+            if len(self._records) >= COMMIT_EVERY:
+                self._commit()
+
+    def commit(self) -> None:
+        """Write pending strings and records and make them visible to readers"""
+        with self._lock:
+            self._commit()
+
+    def _commit(self) -> None:
+        if self._strings:
+            self._file.write(_BLOCK.pack(_STRINGS, len(self._strings) // 2, self._strings_size))
+            self._file.write(b''.join(self._strings))
+            self._end += _BLOCK.size + self._strings_size
+        if self._records:
+            payload = b''.join(self._records)
+            self._file.write(_BLOCK.pack(_RECORDS, len(self._records), len(payload)))
+            self._file.write(payload)
+            self._end += _BLOCK.size + len(payload)
+
+        self._strings = []
+        self._strings_size = 0
+        self._records = []
+        self._file.flush()
+
+        # Advance the committed length only after the blocks are written
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(
+            MAGIC, self._end, self.total_files, self.compliant_files, self._directory_offset
+        ))
+        self._file.flush()
+        self._file.seek(self._end)
+
+    def close(self) -> None:
+        self._closing.set()
+        if self._committer is not None:
+            self._committer.join()
+            self._committer = None
+        with self._lock:
+            if not self._file.closed:
+                self._commit()
+                os.fsync(self._file.fileno())
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ResultFileReader:
+    """Memory-mapped, random-access view of a binary result file.
+
+    Opening only walks the block headers. Records are decoded on access, so
+    the reader can back the virtual results view, the index and exports
+    directly. ``refresh`` picks up records committed since the file was
+    opened by a scanner that is still writing.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._file = open(filename, 'rb')
+        self._map = None
+        self._scanned_to = _HEADER.size
+        self._block_starts: List[int] = []  # Index of the first record in each record block
+        self._block_offsets: List[int] = []  # File offset of each record block's payload
+        self._count = 0
+        self.total_files = 0
+        self.compliant_files = 0
+        self.directory = None
+        self._string = lru_cache(maxsize=4096)(self._read_string)
+        if not self.refresh():
+            self.close()
+            raise ValueError(f"{filename} is not a scan result file")
+
+    def refresh(self) -> bool:
+        """Map newly committed data; returns False if the file is not a result file"""
+        if self._file.closed:
+            raise ValueError(f"{self.filename} is closed")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < _HEADER.size:
+            return False
+        if self._map is None or len(self._map) < size:
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, committed, total_files, compliant_files, directory_offset = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            return False
+        committed = min(committed, len(self._map))
+        self.total_files = total_files
+        self.compliant_files = compliant_files
+        if directory_offset and self.directory is None:
+            self.directory = self._string(directory_offset)
+
+        position = self._scanned_to
+        while position + _BLOCK.size <= committed:
+            kind, count, size = _BLOCK.unpack_from(self._map, position)
+            payload = position + _BLOCK.size
+            if kind == _RECORDS:
+                self._block_starts.append(self._count)
+                self._block_offsets.append(payload)
+                self._count += count
+            position = payload + size
+        self._scanned_to = position
+        return True
+
+    def _read_string(self, offset: int) -> str:
+        (length,) = _LENGTH.unpack_from(self._map, offset)
+        start = offset + _LENGTH.size
+        return self._map[start:start + length].decode('utf-8', STRING_ERRORS)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    def __getitem__(self, index: int) -> Dict:
+        if self._map is None:
+            raise ValueError(f"{self.filename} is closed")
+        if index < 0:
+            index += self._count
+        if index < 0 or index >= self._count:
+            raise IndexError('result index out of range')
+        block = bisect_right(self._block_starts, index) - 1
+        offset = self._block_offsets[block] + (index - self._block_starts[block]) * _RECORD.size
+        offsets = _RECORD.unpack_from(self._map, offset)
+        return {field: self._string(string_offset) for field, string_offset in zip(RESULT_FIELDS, offsets)}
+
+    def __iter__(self) -> Iterator[Dict]:
+        for index in range(self._count):
+            yield self[index]
+
+    def close(self) -> None:
+        self._string.cache_clear()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+def write_result_file(records, filename: str, total_files: int = 0,
+                      compliant_files: int = 0, directory: Optional[str] = None) -> int:
+    """Write result records to a binary result file and return the count"""
+    count = 0
+    with ResultFileWriter(filename, directory, commit_interval=None) as writer:
+        writer.total_files = total_files
+        writer.compliant_files = compliant_files
+        for record in records:
+            writer.append(record)
+            count += 1
+    return count
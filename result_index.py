@@ -0,0 +1,187 @@
+import heapq
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from result_store import RESULT_FIELDS, STRING_ERRORS
+
+# Letters and digits only: '_' separates words in names like Q3_budget_final.xlsx
+_TOKEN = re.compile(r'[^\W_]+')
+
+# Rows whose sort keys are held in memory at once; larger result sets are
+# sorted in runs spilled to temporary files and merged
+SORT_RUN_SIZE = 50000
+
+_RUN_ENTRY = struct.Struct('<II')  # Row id, key length
+
+# Below this fraction of matching rows, sort the matches by rank instead of
+# scanning the whole permutation
+_RANK_SORT_FRACTION = 0.125
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.casefold())
+
+
+class IndexedRows:
+    """Read-only view of result rows in a given order"""
+
+    def __init__(self, rows: Sequence, order: Sequence[int], reverse: bool = False):
+        self.rows = rows
+        self.order = order
+        self.reverse = reverse
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __bool__(self) -> bool:
+        return len(self.order) > 0
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self.order)
+        if self.reverse:
+            index = len(self.order) - 1 - index
+        return self.rows[self.order[index]]
+
+    def __iter__(self):
+        for index in range(len(self.order)):
+            yield self[index]
+
+
+def _write_run(path: str, keyed: List[Tuple[str, int]]) -> None:
+    with open(path, 'wb', buffering=1024 * 1024) as f:
+        for key, row_id in keyed:
+            data = key.encode('utf-8', STRING_ERRORS)
+            f.write(_RUN_ENTRY.pack(row_id, len(data)))
+            f.write(data)
+
+
+def _read_run(path: str) -> Iterator[Tuple[str, int]]:
+    with open(path, 'rb', buffering=1024 * 1024) as f:
+        while True:
+            header = f.read(_RUN_ENTRY.size)
+            if not header:
+                return
+            row_id, length = _RUN_ENTRY.unpack(header)
+            yield f.read(length).decode('utf-8', STRING_ERRORS), row_id
+
+
+def _sorted_run(keys: List[str], start: int) -> List[Tuple[str, int]]:
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    return [(keys[i], start + i) for i in order]
+
+
+class ResultIndex:
+    """Sort and search index over a result sequence.
+
+    Built once per result set: a sorted permutation and its inverse (rank)
+    for each column, plus a token index over names and paths. After
+    that, sorting is a lookup and searching is a few set operations, so the
+    rows themselves are only read for the visible window.
+
+    The rows are read once. Memory use is 8 bytes per row per column for
+    the permutations and ranks, 4 bytes per token in the postings, and the
+    sort keys of at most ``run_size`` rows. Larger result sets that are not
+    in memory, such as a spilled ResultBuffer or a result file, are sorted
+    in runs on disk and merged.
+    """
+
+    def __init__(self, rows: Sequence, run_size: int = SORT_RUN_SIZE):
+        self.rows = rows
+        self.postings: Dict[str, array] = {}
+        self.permutations: Dict[str, array] = {}
+        self.ranks: Dict[str, array] = {}
+        if isinstance(rows, (list, tuple)) or getattr(rows, 'spilled', None) is False:
+            # The rows are in memory already, so one more copy of the keys is within bounds
+            run_size = max(run_size, len(rows))
+
+        temp_dir = None
+        try:
+            run_paths: Dict[str, List[str]] = {field: [] for field in RESULT_FIELDS}
+            keys: Dict[str, List[str]] = {field: [] for field in RESULT_FIELDS}
+            start = 0
+            for row_id, row in enumerate(rows):
+                # The path ends with the name, so its tokens cover both columns
+                for token in set(tokenize(row['path'])):
+                    posting = self.postings.get(token)
+                    if posting is None:
+                        posting = self.postings[token] = array('I')
+                    posting.append(row_id)
+                for field in RESULT_FIELDS:
+                    keys[field].append(row[field].casefold())
+                if row_id + 1 - start >= run_size:
+                    if temp_dir is None:
+                        import tempfile
+                        temp_dir = tempfile.mkdtemp(prefix='spindex-')
+                    for field in RESULT_FIELDS:
+                        path = os.path.join(temp_dir, f'{field}-{len(run_paths[field])}.run')
+                        _write_run(path, _sorted_run(keys[field], start))
+                        run_paths[field].append(path)
+                        keys[field] = []
+                    start = row_id + 1
+
+            for field in RESULT_FIELDS:
+                runs = [_read_run(path) for path in run_paths[field]]
+                runs.append(iter(_sorted_run(keys.pop(field), start)))
+                permutation = array('I', (row_id for _, row_id in heapq.merge(*runs)))
+                rank = array('I', bytes(4 * len(permutation)))
+                for position, row_id in enumerate(permutation):
+                    rank[row_id] = position
+                self.permutations[field] = permutation
+                self.ranks[field] = rank
+        finally:
+            if temp_dir is not None:
+                import shutil
+                shutil.rmtree(temp_dir, ignore_errors=True)
+        self.vocabulary = sorted(self.postings)
+
+    def __len__(self) -> int:
+        return len(self.permutations[RESULT_FIELDS[0]])
+
+    def _match_prefix(self, prefix: str) -> set:
+        matches = set()
+        start = bisect_left(self.vocabulary, prefix)
+        for token in self.vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            matches.update(self.postings[token])
+        return matches
+
+    def search(self, query: str) -> Optional[set]:
+        """Return ids of rows whose name or path has a token starting with every query word.
+
+        Returns None for an empty query, meaning no filter.
+        """
+        words = tokenize(query)
+        if not words:
+            return None
+        matches = None
+        # Longest words first: they usually have the fewest matches
+        for word in sorted(set(words), key=len, reverse=True):
+            word_matches = self._match_prefix(word)
+            matches = word_matches if matches is None else matches & word_matches
+            if not matches:
+                break
+        return matches
+
+    def view(self, query: str = '', sort_field: Optional[str] = None, reverse: bool = False) -> IndexedRows:
+        """Rows matching ``query`` in ``sort_field`` order (scan order if None)"""
+        matches = self.search(query)
+        if sort_field is None:
+            if matches is None:
+                order = range(len(self))
+            else:
+                order = array('I', sorted(matches))
+        else:
+            permutation = self.permutations[sort_field]
+            if matches is None:
+                order = permutation
+            elif len(matches) < len(self) * _RANK_SORT_FRACTION:
+                order = array('I', sorted(matches, key=self.ranks[sort_field].__getitem__))
+            else:
+                order = array('I', [row_id for row_id in permutation if row_id in matches])
+        return IndexedRows(self.rows, order, reverse)
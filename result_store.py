@@ -0,0 +1,183 @@
+import os
+import struct
+import weakref
+from array import array
+from typing import Dict, Iterator, List, Optional
+
+RESULT_FIELDS = ('name', 'path', 'issue', 'suggested_fix')
+
+# Default ceiling for issues kept in memory before spilling to disk (bytes),
+# shared by all result buffers of a scanner
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024
+
+# Rough per-record cost of the dict and string objects on top of the text itself
+_RECORD_OVERHEAD = 600
+
+_HEADER = struct.Struct('<' + 'I' * len(RESULT_FIELDS))
+# Lone surrogates from undecodable file names must survive the round trip
+# through every stored format: buffers, result files, snapshots and index runs
+STRING_ERRORS = 'surrogatepass'
+# Reports for people (CSV exports, diffs) write such names as \udcff escapes
+# so the file stays valid UTF-8
+REPORT_ERRORS = 'backslashreplace'
+
+
+def _encode(record: Dict) -> bytes:
+    values = [record[field].encode('utf-8', STRING_ERRORS) for field in RESULT_FIELDS]
+    return _HEADER.pack(*(len(v) for v in values)) + b''.join(values)
+
+
+def _decode(f) -> Optional[Dict]:
+    header = f.read(_HEADER.size)
+    if not header:
+        return None
+    lengths = _HEADER.unpack(header)
+    data = f.read(sum(lengths))
+    record = {}
+    start = 0
+    for field, length in zip(RESULT_FIELDS, lengths):
+        record[field] = data[start:start + length].decode('utf-8', STRING_ERRORS)
+        start += length
+    return record
+
+
+class MemoryBudget:
+    """Memory ceiling shared by the result buffers of one scanner.
+
+    When the records held in memory by all registered buffers exceed the
+    limit, the buffer holding the most is spilled to disk first.
+    """
+
+    def __init__(self, limit: int = DEFAULT_MEMORY_LIMIT):
+        self.limit = limit
+        self.used = 0
+        self._buffers = weakref.WeakSet()
+
+    def register(self, buffer: 'ResultBuffer') -> None:
+        self._buffers.add(buffer)
+
+    def charge(self, size: int) -> None:
+        self.used += size
+        while self.used > self.limit:
+            largest = max(self._buffers, key=lambda buffer: buffer._tail_bytes, default=None)
+            if largest is None or not largest._tail_bytes:
+                break
+            largest._spill()
+
+    def release(self, size: int) -> None:
+        self.used -= size
+
+
+class ResultBuffer:
+    """Append-only list of issue records with a memory ceiling.
+
+    Records are kept in memory until their estimated size pushes the
+    buffer's budget over its limit; the in-memory tail is then appended to
+    the buffer's spill file, with an offset index, and read back lazily on
+    iteration or indexing. Order is preserved, so the buffer behaves the
+    same whether or not it has spilled. Pass a shared ``budget`` to bound
+    several buffers together; otherwise the buffer gets its own
+    ``memory_limit``.
+    """
+
+    def __init__(self, memory_limit: int = DEFAULT_MEMORY_LIMIT, budget: Optional[MemoryBudget] = None):
+        self.budget = budget if budget is not None else MemoryBudget(memory_limit)
+        self.budget.register(self)
+        self._tail: List[Dict] = []
+        self._tail_bytes = 0
+        self._offsets = array('Q')  # Position of each spilled record in the spill file
+        self._spill_path = None
+        self._spill_size = 0
+        self._handle = None  # Kept open for random access; one per spilled buffer
+
+    @property
+    def memory_limit(self) -> int:
+        return self.budget.limit
+
+    def append(self, record: Dict) -> None:
+        self._tail.append(record)
+        size = _RECORD_OVERHEAD + sum(len(record[field]) for field in RESULT_FIELDS)
+        self._tail_bytes += size
+        self.budget.charge(size)
+
+    def extend(self, records) -> None:
+        for record in records:
+            self.append(record)
+
+    def _spill(self) -> None:
+        import tempfile
+
+        if self._spill_path is None:
+            fd, self._spill_path = tempfile.mkstemp(prefix='spscan-', suffix='.seg')
+            os.close(fd)
+        position = self._spill_size
+        with open(self._spill_path, 'ab', buffering=1024 * 1024) as f:
+            for record in self._tail:
+                data = _encode(record)
+                self._offsets.append(position)
+                f.write(data)
+                position += len(data)
+        self._spill_size = position
+
+        self.budget.release(self._tail_bytes)
+        self._tail = []
+        self._tail_bytes = 0
+
+    @property
+    def spilled(self) -> bool:
+        """True if any records have been written to disk"""
+        return len(self._offsets) > 0
+
+    def __len__(self) -> int:
+        return len(self._offsets) + len(self._tail)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[Dict]:
+        spilled_count = len(self._offsets)
+        tail = list(self._tail)
+        if spilled_count:
+            with open(self._spill_path, 'rb', buffering=1024 * 1024) as f:
+                for _ in range(spilled_count):
+                    yield _decode(f)
+        yield from tail
+
+    def __getitem__(self, index: int) -> Dict:
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError('result index out of range')
+        spilled_count = len(self._offsets)
+        if index >= spilled_count:
+            return self._tail[index - spilled_count]
+        if self._handle is None:
+            self._handle = open(self._spill_path, 'rb')
+        self._handle.seek(self._offsets[index])
+        return _decode(self._handle)
+
+    def clear(self) -> None:
+        """Drop all records and remove the spill file"""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        if self._spill_path is not None:
+            try:
+                os.remove(self._spill_path)
+            except OSError:
+                pass
+            self._spill_path = None
+        self.budget.release(self._tail_bytes)
+        self._offsets = array('Q')
+        self._spill_size = 0
+        self._tail = []
+        self._tail_bytes = 0
+
+    def close(self) -> None:
+        self.clear()
+
+    def __del__(self):
+        try:
+            self.clear()
+        except Exception:
+            pass
@@ -1,9 +1,13 @@
 import os
-import re
-from pathlib import Path
 from typing import Dict, List, Tuple, Set
+from result_store import ResultBuffer, MemoryBudget, DEFAULT_MEMORY_LIMIT
+from exclusions import ExclusionMatcher
+from profiles import RuleSet, default_rules
+from name_validation import NameValidator, RENAME_ISSUES, encoded_path_length
+from links import LINK_POLICIES, LINK_REPORT, LINK_FOLLOW, InodeSet, link_type, identity
 
 class SharePointScanner:
+    # Legacy defaults, matching the built-in SharePoint 2016 profile; scans use self.rules
     MAX_PATH_LENGTH = 260
     INVALID_CHARS = r'[~"#%&*:<>?/\\{|}]'
     
@@ -16,13 +20,28 @@ class SharePointScanner:
         '.vbs'   # Visual Basic Scripts
     }
 
-    def __init__(self):
-        self.issues = []
+    def __init__(self, memory_limit: int = DEFAULT_MEMORY_LIMIT, rules: RuleSet = None):
+        self.memory_limit = memory_limit  # Bytes of results kept in memory before spilling to disk
+        self.budget = MemoryBudget(memory_limit)  # Shared by all of this scanner's result buffers
+        self.rules = rules or default_rules()  # Compiled scan profile, shared between scanners
+        self.validator = NameValidator(self.rules)  # Cached per-name checks
+        self.issues = ResultBuffer(budget=self.budget)
         self.total_files = 0
         self.compliant_files = 0
-        self.unsupported_extensions = self.DEFAULT_UNSUPPORTED.copy()
+        self.unsupported_extensions = set(self.rules.unsupported_extensions)
         self.found_extensions = set()  # Track extensions found in scanned directory
         self.current_directory = None  # Track current directory being scanned
+        self.exclusions = ExclusionMatcher()
+        self.excluded = ResultBuffer(budget=self.budget)  # Entries skipped by exclusion rules
+        self.excluded_dirs = 0
+        self.excluded_files = 0
+        self.link_policy = LINK_REPORT
+        self.dedupe_hard_links = True  # Count content reachable through several hard links once
+        self.link_issues = ResultBuffer(budget=self.budget)  # Links, loops and duplicate content
+        self.collect_metadata = False  # Owner, permission and age collection; off costs nothing
+        self.stale_days = None  # Days without changes before a file is stale (default 3 years)
+        self.metadata = None  # MetadataCollector of the last scan, if collection was on
+        self.on_issue = None  # Optional callback for each new issue, e.g. to stream results to a file
 
     def add_unsupported_extension(self, extension: str) -> None:
         """Add a single extension to the unsupported list"""
@@ -42,26 +61,167 @@ class SharePointScanner:
         self.unsupported_extensions.discard(extension.lower())
 
     def reset_unsupported_extensions(self) -> None:
-        """Reset to default unsupported extensions"""
-        self.unsupported_extensions = self.DEFAULT_UNSUPPORTED.copy()
+        """Reset to the profile's unsupported extensions"""
+        self.unsupported_extensions = set(self.rules.unsupported_extensions)
+
+    def set_rules(self, rules: RuleSet) -> None:
+        """Switch to another compiled scan profile"""
+        self.rules = rules
+        self.validator = NameValidator(rules)
+        self.reset_unsupported_extensions()
 
     def get_unsupported_extensions(self) -> Set[str]:
         """Get the current set of unsupported extensions"""
         return self.unsupported_extensions.copy()
 
-    def scan_directory(self, directory: str) -> List[Dict]:
-        self.issues = []
+    def set_exclusions(self, patterns: List[str]) -> None:
+        """Set glob or 're:' regex patterns for entries to skip during scans"""
+        self.exclusions = ExclusionMatcher(patterns)
+
+    def get_exclusions(self) -> List[str]:
+        """Get the current exclusion patterns"""
+        return list(self.exclusions.patterns)
+
+    def set_link_policy(self, policy: str) -> None:
+        """Set how symbolic links and junctions are handled: follow, report or skip"""
+        if policy not in LINK_POLICIES:
+            raise ValueError(f"Unknown link policy: {policy}")
+        self.link_policy = policy
+
+    def set_metadata_collection(self, enabled: bool, stale_days: int = None) -> None:
+        """Turn collection of owners, permissions and file ages on or off"""
+        if stale_days is not None and stale_days <= 0:
+            raise ValueError("stale_days must be a positive number of days")
+        self.collect_metadata = enabled
+        self.stale_days = stale_days
+
+    def _walk(self, directory: str, record: bool = False):
+        """Top-down walk like os.walk that yields DirEntry lists.
+
+        Exclusion rules are applied to each listing, so excluded directories
+        are never opened. Links are handled according to the link policy, and
+        directories are only descended once per (st_dev, st_ino) so link
+        loops and repeated mounts cannot make the walk run forever.
+        """
+        visited_dirs = InodeSet()
+        try:
+            st = os.stat(directory)
+            visited_dirs.add(st.st_dev, st.st_ino)
+        except OSError:
+            pass
+
+        stack = [(directory, '')]
+        while stack:
+            root, rel_root = stack.pop()
+            try:
+                with os.scandir(root) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            if self.link_policy == LINK_FOLLOW:
+                # Real entries claim their inodes before links to them, so only
+                # the links are reported as paths to content already scanned
+                entries.sort(key=lambda entry: link_type(entry) is not None)
+
+            dirs = []
+            files = []
+            descend = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                rel_path = f"{rel_root}/{entry.name}" if rel_root else entry.name
+                if self.exclusions and self.exclusions.matches(rel_path):
+                    if record:
+                        self._record_exclusion(entry.path, is_dir)
+                    continue
+
+                link = link_type(entry)
+                if link and self.link_policy != LINK_FOLLOW:
+                    if record and self.link_policy == LINK_REPORT:
+                        self._record_link(entry.path, f"{link} (not followed)")
+                    continue
+                if link and not os.path.exists(entry.path):
+                    if record:
+                        self._record_link(entry.path, f"Broken {link.lower()}")
+                    continue
+
+                if not is_dir:
+                    files.append(entry)
+                    continue
+                dirs.append(entry)
+                st = identity(entry, follow_symlinks=True)
+                if st is None or visited_dirs.add(st.st_dev, st.st_ino):
+                    descend.append((entry.path, rel_path))
+                elif record:
+                    self._record_link(entry.path, "Folder already scanned through another path (link loop or mount)")
+
+            yield root, dirs, files
+
+            stack.extend(reversed(descend))
+
+    def _record_link(self, path: str, issue: str) -> None:
+        if issue.startswith("Folder already scanned"):
+            fix = "Remove the duplicate path or exclude it from migration"
+        elif issue.startswith("Content already scanned"):
+            fix = "Content is migrated once; other paths become separate copies"
+        else:
+            fix = "Replace with the target content or a SharePoint link"
+        self.link_issues.append({
+            'name': os.path.basename(path),
+            'path': path,
+            'issue': issue,
+            'suggested_fix': fix
+        })
+
+    def _is_repeated_file(self, entry: os.DirEntry, seen_files: InodeSet) -> bool:
+        """Check whether a file's content was already counted under another path"""
+        follow = self.link_policy == LINK_FOLLOW
+        st = identity(entry, follow_symlinks=follow)
+        if st is None:
+            return False
+        # Without followed links only multiply-linked files can repeat, which keeps
+        # the set small; when following, any file may be the target of a link
+        if st.st_nlink <= 1 and not follow:
+            return False
+        return not seen_files.add(st.st_dev, st.st_ino)
+
+    def _record_exclusion(self, path: str, is_dir: bool) -> None:
+        if is_dir:
+            self.excluded_dirs += 1
+            issue = "Excluded folder (contents not scanned)"
+        else:
+            self.excluded_files += 1
+            issue = "Excluded file"
+        self.excluded.append({
+            'name': os.path.basename(path),
+            'path': path,
+            'issue': issue,
+            'suggested_fix': "Not migrated"
+        })
+
+    def scan_directory(self, directory: str) -> ResultBuffer:
+        self.issues = ResultBuffer(budget=self.budget)
+        self.excluded = ResultBuffer(budget=self.budget)
         self.total_files = 0
         self.compliant_files = 0
+        self.excluded_dirs = 0
+        self.excluded_files = 0
+        self.link_issues = ResultBuffer(budget=self.budget)
         self.found_extensions = set()
         self.current_directory = directory
+        self.metadata = None
         
         print(f"Starting scan of directory: {directory}")
+        if self.exclusions:
+            print(f"Exclusion rules: {self.exclusions.patterns}")
         
         # First pass: collect all extensions
         print("Starting first pass - collecting extensions...")
-        for root, dirs, files in os.walk(directory):
-            for file in files:
+        for root, dirs, files in self._walk(directory):
+            for entry in files:
+                file = entry.name
                 ext = os.path.splitext(file)[1].lower()
                 if ext:  # Only add if extension exists
                     self.found_extensions.add(ext)
@@ -72,34 +232,75 @@ class SharePointScanner:
         
         # Second pass: check for issues and count files
         print("Starting second pass - checking for issues...")
-        for root, dirs, files in os.walk(directory):
-            for file in files:
+        metadata = None
+        if self.collect_metadata:
+            from metadata import MetadataCollector
+            metadata = MetadataCollector(self.budget, self.stale_days)
+        seen_files = InodeSet()
+        for root, dirs, files in self._walk(directory, record=True):
+            # Encode the directory once; names add their cached encoded lengths
+            root_encoded_length = None
+            if self.rules.max_encoded_path_length is not None:
+                root_encoded_length = encoded_path_length(root)
+            for entry in files:
+                if self.dedupe_hard_links and self._is_repeated_file(entry, seen_files):
+                    # The path is still migrated as a copy, so its name is checked,
+                    # but the content only counts once toward the score
+                    self._record_link(entry.path, "Content already scanned through another path")
+                    self._check_item(entry.path, False, entry.name, root_encoded_length, counted=False)
+                    continue
                 self.total_files += 1
-                full_path = os.path.join(root, file)
-                self._check_item(full_path, False)
+                self._check_item(entry.path, False, entry.name, root_encoded_length)
+                if metadata is not None:
+                    metadata.add(entry, False)
             
             # Check directory names
-            for dir_name in dirs:
-                dir_path = os.path.join(root, dir_name)
-                self._check_item(dir_path, True)
+            for entry in dirs:
+                self._check_item(entry.path, True, entry.name, root_encoded_length)
+                if metadata is not None:
+                    metadata.add(entry, True)
+
+        if metadata is not None:
+            metadata.close()
+            self.metadata = metadata
         
         print(f"Scan complete. Total files: {self.total_files}, Issues found: {len(self.issues)}")
+        print(f"Excluded: {self.excluded_dirs} folders, {self.excluded_files} files")
+        print(f"Link issues: {len(self.link_issues)} (policy: {self.link_policy})")
         print(f"Compliant files: {self.compliant_files}")
+        if metadata is not None:
+            print(f"Stale files: {metadata.stale_files}, unique permissions: {metadata.unique_permissions}")
+            print(f"Age rollup: {metadata.age_rollup}")
+            print(f"Top owners: {metadata.top_owners()}")
         return self.issues
 
-    def _check_item(self, path: str, is_dir: bool) -> None:
+    def _check_item(self, path: str, is_dir: bool, name: str = None,
+                    parent_encoded_length: int = None, counted: bool = True) -> None:
         issues_found = []
+        if name is None:
+            name = os.path.basename(path)
+        name_issues, name_encoded_length = self.validator.check(name)
         
         # Check path length
         path_length = len(path)
-        if path_length > self.MAX_PATH_LENGTH:
-            excess_length = path_length - self.MAX_PATH_LENGTH
-            issues_found.append(f"Path exceeds 260 characters (by {excess_length} characters)")
+        max_path_length = self.rules.max_path_length
+        if path_length > max_path_length:
+            excess_length = path_length - max_path_length
+            issues_found.append(f"Path exceeds {max_path_length} characters (by {excess_length} characters)")
+        elif self.rules.max_encoded_path_length is not None:
+            # A path within the character limit can still be too long once URL-encoded
+            if parent_encoded_length is None:
+                parent_encoded_length = encoded_path_length(os.path.dirname(path))
+            encoded_length = parent_encoded_length + 1 + name_encoded_length
+            max_encoded_length = self.rules.max_encoded_path_length
+            if encoded_length > max_encoded_length:
+                issues_found.append(
+                    f"URL-encoded path exceeds {max_encoded_length} characters "
+                    f"(by {encoded_length - max_encoded_length} characters)"
+                )
 
-        # Check invalid characters
-        name = os.path.basename(path)
-        if re.search(self.INVALID_CHARS, name):
-            issues_found.append("Contains invalid characters")
+        # Check invalid characters, encoding and normalization of the name
+        issues_found.extend(name_issues)
 
         # Check file extension for files only
         if not is_dir:
@@ -109,15 +310,18 @@ class SharePointScanner:
 
         # Only add to issues list if there are actual issues
         if issues_found:
-            self.issues.append({
+            issue = {
                 'name': os.path.basename(path),
                 'path': path,
                 'issue': '; '.join(issues_found),
                 'suggested_fix': self._suggest_fix(issues_found, name, path_length)
-            })
+            }
+            self.issues.append(issue)
+            if self.on_issue is not None:
+                self.on_issue(issue)
 
         # Update compliant files count
-        if not is_dir:  # Only count files, not directories
+        if not is_dir and counted:  # Only count files, not directories or repeated content
             if not issues_found:  # If no issues were found
                 self.compliant_files += 1
 
@@ -125,11 +329,14 @@ class SharePointScanner:
         fixes = []
         
         if any("Path exceeds" in issue for issue in issues):
-            excess = path_length - self.MAX_PATH_LENGTH
+            excess = path_length - self.rules.max_path_length
             fixes.append(f"Move to a shorter path (need to reduce by at least {excess} characters)")
             
-        if "Contains invalid characters" in issues:
-            fixed_name = re.sub(self.INVALID_CHARS, '_', name)
+        if any("URL-encoded path exceeds" in issue for issue in issues):
+            fixes.append("Shorten the path or use fewer non-ASCII and special characters")
+
+        if any(issue in RENAME_ISSUES for issue in issues):
+            fixed_name = self.fix_name(name)
             fixes.append(f"Rename to: {fixed_name}")
             
         if any("Unsupported file type" in issue for issue in issues):
@@ -137,6 +344,10 @@ class SharePointScanner:
             
         return '; '.join(fixes)
 
+    def fix_name(self, name: str) -> str:
+        """Return the name with invalid characters and encoding problems fixed"""
+        return self.validator.fix_name(name)
+
     def get_compliance_score(self) -> float:
         """Calculate compliance score based on migratable files"""
         if self.total_files == 0:
@@ -159,12 +370,12 @@ class SharePointScanner:
         """Get the currently scanned directory"""
         return self.current_directory
 
-    def get_filtered_issues(self):
+    def get_filtered_issues(self) -> ResultBuffer:
         """Return issues filtered by current unsupported extensions"""
+        filtered_issues = ResultBuffer(budget=self.budget)
         if not self.issues:
-            return []
+            return filtered_issues
         
-        filtered_issues = []
         for issue in self.issues:
             file_path = issue['path']
             file_ext = os.path.splitext(file_path)[1].lower()
@@ -0,0 +1,143 @@
+import csv
+import heapq
+import os
+import tempfile
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from result_store import STRING_ERRORS
+
+SNAPSHOT_HEADER = '#sharepoint-scanner-snapshot v1'
+SNAPSHOT_FIELDS = ('name', 'path', 'issue', 'suggested_fix')
+DIFF_FIELDS = ('change', 'name', 'path', 'old_issue', 'new_issue', 'suggested_fix')
+
+# Number of records sorted in memory at once before spilling a run to disk
+RUN_SIZE = 100000
+
+
+def _sort_key(record: Dict) -> str:
+    return record['path']
+
+
+def _write_rows(f, records: Iterable[Dict]) -> int:
+    writer = csv.writer(f)
+    count = 0
+    for record in records:
+        writer.writerow([record[field] for field in SNAPSHOT_FIELDS])
+        count += 1
+    return count
+
+
+def _read_rows(f) -> Iterator[Dict]:
+    for row in csv.reader(f):
+        yield dict(zip(SNAPSHOT_FIELDS, row))
+
+
+def _spill_run(records: List[Dict], temp_dir: str) -> str:
+    records.sort(key=_sort_key)
+    fd, run_path = tempfile.mkstemp(suffix='.run', dir=temp_dir)
+    with os.fdopen(fd, 'w', newline='', encoding='utf-8', errors=STRING_ERRORS) as f:
+        _write_rows(f, records)
+    return run_path
+
+
+def write_snapshot(records: Iterable[Dict], filename: str, run_size: int = RUN_SIZE) -> int:
+    """Write scan results to a snapshot file sorted by path.
+
+    Records are sorted in runs of at most ``run_size`` entries which are
+    then merged, so memory use does not depend on the number of results.
+    Returns the number of records written.
+    """
+    with tempfile.TemporaryDirectory(prefix='spsnap-') as temp_dir:
+        run_paths = []
+        run = []
+        for record in records:
+            run.append(record)
+            if len(run) >= run_size:
+                run_paths.append(_spill_run(run, temp_dir))
+                run = []
+        run.sort(key=_sort_key)
+
+        run_files = [open(p, newline='', encoding='utf-8', errors=STRING_ERRORS) for p in run_paths]
+        try:
+            sources = [_read_rows(f) for f in run_files]
+            sources.append(iter(run))
+            with open(filename, 'w', newline='', encoding='utf-8', errors=STRING_ERRORS) as out:
+                out.write(SNAPSHOT_HEADER + '\n')
+                return _write_rows(out, heapq.merge(*sources, key=_sort_key))
+        finally:
+            for f in run_files:
+                f.close()
+
+
+def read_snapshot(filename: str) -> Iterator[Dict]:
+    """Stream records from a snapshot file in path order"""
+    with open(filename, newline='', encoding='utf-8', errors=STRING_ERRORS) as f:
+        header = f.readline().rstrip('\r\n')
+        if header != SNAPSHOT_HEADER:
+            raise ValueError(f"{filename} is not a scanner snapshot")
+        yield from _read_rows(f)
+
+
+def _next(records: Iterator[Dict]) -> Optional[Dict]:
+    return next(records, None)
+
+
+def diff_snapshots(old_filename: str, new_filename: str) -> Iterator[Dict]:
+    """Compare two snapshots with a streaming sorted merge.
+
+    Yields one record per difference with ``change`` set to 'added',
+    'removed' or 'changed'. Only the current record of each snapshot is
+    held in memory.
+    """
+    old_records = read_snapshot(old_filename)
+    new_records = read_snapshot(new_filename)
+    old = _next(old_records)
+    new = _next(new_records)
+
+    while old is not None or new is not None:
+        if new is None or (old is not None and old['path'] < new['path']):
+            yield {
+                'change': 'removed',
+                'name': old['name'],
+                'path': old['path'],
+                'old_issue': old['issue'],
+                'new_issue': '',
+                'suggested_fix': '',
+            }
+            old = _next(old_records)
+        elif old is None or new['path'] < old['path']:
+            yield {
+                'change': 'added',
+                'name': new['name'],
+                'path': new['path'],
+                'old_issue': '',
+                'new_issue': new['issue'],
+                'suggested_fix': new['suggested_fix'],
+            }
+            new = _next(new_records)
+        else:
+            if old['issue'] != new['issue']:
+                yield {
+                    'change': 'changed',
+                    'name': new['name'],
+                    'path': new['path'],
+                    'old_issue': old['issue'],
+                    'new_issue': new['issue'],
+                    'suggested_fix': new['suggested_fix'],
+                }
+            old = _next(old_records)
+            new = _next(new_records)
+
+
+def write_diff(changes: Iterable[Dict], f) -> Dict[str, int]:
+    """Write diff records as CSV to an open file and return per-change counts.
+
+    Open ``f`` with ``errors=result_store.REPORT_ERRORS`` so undecodable names can be written.
+    """
+    counts = {'added': 0, 'removed': 0, 'changed': 0}
+    writer = csv.writer(f)
+    writer.writerow(['Change', 'Name', 'Path', 'Old Issue', 'New Issue', 'Suggested Fix'])
+    for change in changes:
+        writer.writerow([change[field] for field in DIFF_FIELDS])
+        counts[change['change']] += 1
+    return counts
@@ -0,0 +1,13 @@
+import pytest
+
+from bench_import import HEADLESS_MODULES, LAZY_MODULES, measure
+
+
+# Only the import set is checked here; the timing budget stays in the script,
+# where a slow machine cannot turn it into a flaky test
+@pytest.mark.parametrize('module', HEADLESS_MODULES)
+def test_headless_modules_do_not_import_lazy_modules(module):
+    _, imported = measure(module)
+
+    assert module in imported
+    assert not imported & LAZY_MODULES
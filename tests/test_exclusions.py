@@ -0,0 +1,41 @@
+import pytest
+
+from exclusions import ExclusionMatcher
+
+
+def test_globs_match_names_and_relative_paths():
+    matcher = ExclusionMatcher(['node_modules', '*.bak', 'Archive/2019*'])
+
+    assert matcher.matches('src/node_modules')
+    assert matcher.matches('Docs/Old.BAK')
+    assert matcher.matches('archive/2019-q1')
+    assert not matcher.matches('Docs/Archive/2019-q1')
+    assert not matcher.matches('Docs/report.docx')
+
+
+def test_regex_inline_flags_are_kept():
+    matcher = ExclusionMatcher(['*.tmp', 're:(?i)foo'])
+
+    assert matcher.matches('a/FOO.txt')
+    assert matcher.matches('a/b.tmp')
+
+
+def test_regex_group_references_are_not_renumbered():
+    matcher = ExclusionMatcher(['re:(a)\\1', 're:(b)\\1'])
+
+    assert matcher.matches('x/bb')
+    assert matcher.matches('x/aa')
+    assert not matcher.matches('x/ab')
+
+
+@pytest.mark.parametrize('pattern', ['re:[', 'bad[z-a]'])
+def test_invalid_patterns_raise_value_error_naming_the_pattern(pattern):
+    with pytest.raises(ValueError, match=pattern.replace('[', r'\[')):
+        ExclusionMatcher([pattern])
+
+
+def test_empty_matcher_matches_nothing():
+    matcher = ExclusionMatcher(['', '  '])
+
+    assert not matcher
+    assert not matcher.matches('anything')
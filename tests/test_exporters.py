@@ -0,0 +1,40 @@
+import csv
+import os
+
+import pytest
+
+from exporters import write_csv
+from scanner import SharePointScanner
+
+
+def test_write_csv_escapes_undecodable_names(tmp_path):
+    records = [{
+        'name': 'bad\udcff.txt',
+        'path': '/share/bad\udcff.txt',
+        'issue': 'Name contains bytes that are not valid UTF-8',
+        'suggested_fix': 'Rename to: bad_.txt'
+    }, {
+        'name': 'half\ud800.txt',
+        'path': '/share/half\ud800.txt',
+        'issue': 'Name contains unpaired UTF-16 surrogates',
+        'suggested_fix': 'Rename to: half_.txt'
+    }]
+    filename = tmp_path / 'out.csv'
+
+    assert write_csv(records, str(filename)) == 2
+
+    with open(filename, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert rows[1][1] == '/share/bad\\udcff.txt'
+    assert rows[2][1] == '/share/half\\ud800.txt'
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="Windows file names are always valid UTF-16")
+def test_scan_with_undecodable_name_exports(tmp_path):
+    (tmp_path / os.fsdecode(b'bad\xff.txt')).write_text('x')
+    scanner = SharePointScanner()
+    issues = scanner.scan_directory(str(tmp_path))
+    filename = tmp_path / 'out.csv'
+
+    assert write_csv(issues, str(filename)) == 1
+    assert 'bad\\udcff.txt' in filename.read_text(encoding='utf-8')
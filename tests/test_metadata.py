@@ -0,0 +1,127 @@
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+import metadata
+from metadata import AGE_BUCKETS, MetadataCollector, group_name, user_name
+from scanner import SharePointScanner
+
+NOW = 1700000000
+DAY = 86400
+
+
+def make_files(folder, ages_in_days, size=1):
+    """Create one file per age, last modified that many days before NOW"""
+    for i, days in enumerate(ages_in_days):
+        path = folder / f'f{i}.txt'
+        path.write_bytes(b'x' * size)
+        os.utime(path, (NOW - days * DAY, NOW - days * DAY))
+
+
+def collect(folder, **options):
+    collector = MetadataCollector(now=NOW, check_permissions=False, **options)
+    with os.scandir(folder) as it:
+        for entry in sorted(it, key=lambda entry: entry.name):
+            collector.add(entry, entry.is_dir())
+    collector.close()
+    return collector
+
+
+def test_age_bucket_edges(tmp_path):
+    make_files(tmp_path, [0, 30, 30.5, 365, 366, 3 * 365, 3 * 365 + 1])
+
+    collector = collect(tmp_path)
+
+    labels = [label for _, label in AGE_BUCKETS]
+    assert [collector.age_rollup[label][0] for label in labels] == [2, 2, 2, 1]
+    assert sum(files for files, _ in collector.age_rollup.values()) == 7
+
+
+def test_stale_files_are_counted_against_stale_days(tmp_path):
+    make_files(tmp_path, [99, 99.9, 100, 250])
+
+    collector = collect(tmp_path, stale_days=100)
+
+    assert collector.stale_files == 2
+    stale = sorted(issue['name'] for issue in collector.issues)
+    assert stale == ['f2.txt', 'f3.txt']
+    assert all(issue['issue'].startswith("Not modified for") for issue in collector.issues)
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="POSIX owners come from the stat result")
+def test_owner_and_group_rollups(tmp_path):
+    make_files(tmp_path, [1, 2, 3], size=10)
+    (tmp_path / 'folder').mkdir()
+
+    collector = collect(tmp_path)
+
+    st = os.stat(tmp_path / 'f0.txt')
+    # Folders are not rolled up, only files
+    assert collector.owner_rollup == {user_name(st.st_uid): [3, 30]}
+    assert collector.group_rollup == {group_name(st.st_gid): [3, 30]}
+    assert collector.top_owners() == [(user_name(st.st_uid), [3, 30])]
+    assert collector.rollups()['Owner'] is collector.owner_rollup
+
+
+def test_close_collects_pending_lookup_batches(tmp_path, monkeypatch):
+    release = threading.Event()
+    looked_up = []
+
+    def lookup(path, is_dir):
+        release.wait(5)
+        looked_up.append(path)
+        return 'alice', ('extended ACL' if path.endswith('f1.txt') else None)
+
+    monkeypatch.setattr(metadata, '_permission_lookup', lambda: lookup)
+    monkeypatch.setattr(metadata, 'BATCH_SIZE', 2)
+    make_files(tmp_path, [1, 2, 3, 4, 5], size=2)
+
+    collector = MetadataCollector(now=NOW, workers=2)
+    with os.scandir(tmp_path) as it:
+        for entry in it:
+            collector.add(entry, False)
+
+    # Lookups are still blocked, so nothing has been rolled up by owner yet
+    assert collector.owner_rollup == {}
+    release.set()
+    collector.close()
+
+    assert len(looked_up) == 5
+    assert collector.owner_rollup == {'alice': [5, 10]}
+    assert collector.unique_permissions == 1
+    assert [issue['issue'] for issue in collector.issues] == ["Unique permissions (extended ACL)"]
+
+
+def test_scanner_collects_metadata_only_when_enabled(tmp_path):
+    make_files(tmp_path, [4000])
+
+    scanner = SharePointScanner()
+    scanner.scan_directory(str(tmp_path))
+    assert scanner.metadata is None
+
+    scanner.set_metadata_collection(True, stale_days=365)
+    scanner.scan_directory(str(tmp_path))
+    assert scanner.metadata.stale_files == 1
+
+    scanner.set_metadata_collection(False)
+    scanner.scan_directory(str(tmp_path))
+    assert scanner.metadata is None
+
+
+def test_metadata_module_is_not_imported_when_collection_is_off(tmp_path):
+    make_files(tmp_path, [1])
+    code = (
+        "import sys, scanner\n"
+        f"scanner.SharePointScanner().scan_directory({str(tmp_path)!r})\n"
+        "print('metadata' in sys.modules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.splitlines()[-1] == 'False'
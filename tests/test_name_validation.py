@@ -0,0 +1,117 @@
+import unicodedata
+
+import pytest
+
+from name_validation import (
+    INVALID_AFTER_NFC, INVALID_CHARACTERS, MAX_NAME_BYTES, NAME_TOO_LONG, NOT_NFC, UNDECODABLE,
+    UNPAIRED_SURROGATE, NameValidator, encoded_length, encoded_path_length,
+)
+from profiles import compile_profile, default_rules
+from scanner import SharePointScanner
+
+
+@pytest.fixture
+def validator():
+    return NameValidator(default_rules())
+
+
+def test_clean_names_have_no_issues(validator):
+    assert validator.check('Meeting notes final.docx')[0] == ()
+    assert validator.check('café.txt')[0] == ()
+
+
+def test_invalid_characters(validator):
+    assert validator.check('a:b.txt')[0] == (INVALID_CHARACTERS,)
+    assert validator.fix_name('a:b?.txt') == 'a_b_.txt'
+
+
+def test_decomposed_names_are_not_nfc(validator):
+    name = unicodedata.normalize('NFD', 'café.txt')
+
+    assert validator.check(name)[0] == (NOT_NFC,)
+    assert validator.fix_name(name) == 'café.txt'
+
+
+def test_invalid_character_that_only_appears_after_nfc():
+    # A decomposed 'é' only contains the forbidden precomposed character once normalized
+    rules = compile_profile('No e-acute', {'invalid_characters': 'é'})
+    validator = NameValidator(rules)
+
+    assert validator.check(unicodedata.normalize('NFD', 'café'))[0] == (INVALID_AFTER_NFC,)
+    assert validator.check('café')[0] == (INVALID_CHARACTERS,)
+
+
+def test_undecodable_bytes_and_unpaired_surrogates(validator):
+    # os.fsdecode(b'bad\xff.txt') on POSIX
+    assert validator.check('bad\udcff.txt')[0] == (UNDECODABLE,)
+    assert validator.check('half\ud800.txt')[0] == (UNPAIRED_SURROGATE,)
+    assert validator.fix_name('bad\udcff.txt') == 'bad_.txt'
+    assert validator.fix_name('half\ud800.txt') == 'half_.txt'
+
+
+def test_names_over_255_utf8_bytes(validator):
+    ascii_name = 'a' * MAX_NAME_BYTES + '.txt'
+    cjk_name = '漢' * 90 + '.txt'  # 274 UTF-8 bytes in 94 characters
+
+    assert validator.check('a' * (MAX_NAME_BYTES - 4) + '.txt')[0] == ()
+    assert validator.check(ascii_name)[0] == (NAME_TOO_LONG,)
+    assert validator.check(cjk_name)[0] == (NAME_TOO_LONG,)
+
+    for name in (ascii_name, cjk_name):
+        fixed = validator.fix_name(name)
+        assert len(fixed.encode('utf-8')) <= MAX_NAME_BYTES
+        assert fixed.endswith('.txt')
+        assert validator.check(fixed)[0] == ()
+
+
+def test_encoded_length():
+    assert encoded_length('abc-._~') == 7
+    assert encoded_length('a b') == 5  # Space becomes %20
+    assert encoded_length('é') == 6  # Two UTF-8 bytes, each %XX
+    assert encoded_length('#') == 3
+    assert encoded_path_length('/share/a b') == len('/share/a%20b')
+
+
+def test_checks_and_fixes_are_cached(validator):
+    for _ in range(3):
+        validator.check('a:b.txt')
+        validator.fix_name('a:b.txt')
+
+    assert validator.cache_info().hits == 2
+    assert validator.cache_info().misses == 1
+    assert validator.fix_name.cache_info().hits == 2
+
+
+def test_cache_is_bounded():
+    validator = NameValidator(default_rules(), cache_size=4)
+    for i in range(10):
+        validator.check(f'name{i}.txt')
+
+    assert validator.cache_info().currsize == 4
+
+
+def test_plain_ascii_path_is_not_flagged_by_default(tmp_path):
+    folder = tmp_path / 'My Documents'
+    folder.mkdir()
+    # Pad the name so the whole path is 250 characters, under the 260 limit,
+    # but over it once each space counts as %20
+    padding = 250 - len(str(folder / 'Meeting notes final.docx'))
+    name = 'Meeting notes' + ' x' * (padding // 2) + 'x' * (padding % 2) + ' final.docx'
+    (folder / name).write_text('x')
+    assert len(str(folder / name)) == 250
+    assert encoded_path_length(str(folder / name)) > 260
+
+    scanner = SharePointScanner()
+    scanner.scan_directory(str(tmp_path))
+
+    assert scanner.get_compliance_score() == 100.0
+
+
+def test_encoded_limit_applies_when_the_profile_sets_it(tmp_path):
+    (tmp_path / 'a b c.txt').write_text('x')
+    limit = len(str(tmp_path / 'a b c.txt')) + 2
+
+    scanner = SharePointScanner(rules=compile_profile('Encoded', {'max_encoded_path_length': limit}))
+    issues = list(scanner.scan_directory(str(tmp_path)))
+
+    assert [issue['issue'] for issue in issues] == [f"URL-encoded path exceeds {limit} characters (by 2 characters)"]
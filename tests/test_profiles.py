@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+from profiles import compile_profile, load_profiles
+
+
+def test_empty_invalid_characters_match_nothing():
+    rules = compile_profile('Anything goes', {'invalid_characters': ''})
+
+    assert rules.invalid_pattern.search('a:b*c?') is None
+
+
+def test_invalid_profile_settings_raise_value_error(tmp_path):
+    config = tmp_path / 'config.json'
+    config.write_text(json.dumps({'profiles': {'Broken': {'max_path_length': 0}}}))
+
+    with pytest.raises(ValueError, match='max_path_length'):
+        load_profiles(str(config))
+
+
+def test_profile_from_config_replaces_builtin(tmp_path):
+    config = tmp_path / 'config.json'
+    config.write_text(json.dumps({'profiles': {'OneDrive': {'max_path_length': 100, 'invalid_characters': ''}}}))
+
+    rules = load_profiles(str(config))['OneDrive']
+
+    assert rules.max_path_length == 100
+    assert rules.max_encoded_path_length is None
+    assert rules.invalid_characters == ''
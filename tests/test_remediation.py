@@ -0,0 +1,112 @@
+import json
+import os
+
+import pytest
+
+from remediation import apply_plan, build_rename_plan, check_plan, read_journal, rollback
+
+pytestmark = pytest.mark.skipif(os.name == 'nt', reason="uses names that Windows does not allow")
+
+
+def fix_name(name):
+    return name.replace(':', '_').replace('*', '_')
+
+
+@pytest.fixture
+def share(tmp_path):
+    # Journals go in tmp_path, next to the tree being renamed
+    path = tmp_path / 'share'
+    path.mkdir()
+    return path
+
+
+def issue(path):
+    return {'name': os.path.basename(path), 'path': str(path), 'issue': 'Contains invalid characters', 'suggested_fix': ''}
+
+
+def test_colliding_targets_get_numbered_suffixes(share, tmp_path):
+    for name in ('a_b.txt', 'a:b.txt', 'a*b.txt'):
+        (share / name).write_text(name)
+
+    plan = build_rename_plan([issue(share / 'a:b.txt'), issue(share / 'a*b.txt')], fix_name)
+
+    targets = {os.path.basename(op.source): os.path.basename(op.target) for op in plan}
+    assert targets == {'a:b.txt': 'a_b (2).txt', 'a*b.txt': 'a_b (3).txt'}
+    assert len(plan.adjusted) == 2
+
+    result = apply_plan(plan, str(tmp_path / 'collide.journal'))
+    assert result.renamed == 2 and not result.failed
+    assert sorted(os.listdir(share)) == ['a_b (2).txt', 'a_b (3).txt', 'a_b.txt']
+    assert (share / 'a_b.txt').read_text() == 'a_b.txt'
+
+
+def test_children_are_renamed_before_parents(share, tmp_path):
+    folder = share / 'bad:folder'
+    (folder / 'sub:dir').mkdir(parents=True)
+    (folder / 'sub:dir' / 'bad:file.txt').write_text('x')
+    issues = [issue(folder), issue(folder / 'sub:dir'), issue(folder / 'sub:dir' / 'bad:file.txt')]
+
+    plan = build_rename_plan(issues, fix_name)
+
+    assert [os.path.basename(op.source) for op in plan] == ['bad:file.txt', 'sub:dir', 'bad:folder']
+    result = apply_plan(plan, str(tmp_path / 'order.journal'), workers=4)
+    assert result.renamed == 3 and not result.failed
+    assert (share / 'bad_folder' / 'sub_dir' / 'bad_file.txt').read_text() == 'x'
+
+
+def test_rollback_restores_an_interrupted_run(share, tmp_path):
+    folder = share / 'bad:folder'
+    folder.mkdir()
+    (folder / 'one:a.txt').write_text('1')
+    (folder / 'two:b.txt').write_text('2')
+    plan = build_rename_plan([issue(folder / 'one:a.txt'), issue(folder / 'two:b.txt'), issue(folder)], fix_name)
+    journal = tmp_path / 'interrupted.journal'
+
+    # Simulate a crash: both children were logged, only the first was renamed,
+    # and the last line was torn before the parent was logged
+    first, second = plan.ops[0], plan.ops[1]
+    os.rename(first.source, first.target)
+    with open(journal, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'journal': 1, 'planned': len(plan)}) + '\n')
+        for op in (first, second):
+            f.write(json.dumps({'source': op.source, 'target': op.target, 'depth': op.depth}) + '\n')
+        f.write('{"source": "/tr')
+
+    assert [op.source for op in read_journal(str(journal))] == [first.source, second.source]
+
+    result = rollback(str(journal))
+    assert result.renamed == 1 and not result.failed
+    assert sorted(os.listdir(folder)) == ['one:a.txt', 'two:b.txt']
+
+
+def test_failed_renames_are_not_rolled_back(share, tmp_path):
+    (share / 'a:b.txt').write_text('x')
+    plan = build_rename_plan([issue(share / 'a:b.txt')], fix_name)
+    (share / 'a_b.txt').write_text('appeared after planning')
+    journal = str(tmp_path / 'failed.journal')
+
+    result = apply_plan(plan, journal)
+
+    assert result.renamed == 0 and len(result.failed) == 1
+    assert read_journal(journal) == []
+    assert rollback(journal).renamed == 0
+    assert (share / 'a_b.txt').read_text() == 'appeared after planning'
+
+
+def test_dry_run_checks_sources_and_targets_without_renaming(share, tmp_path):
+    folder = share / 'bad:folder'
+    folder.mkdir()
+    for name in ('one:a.txt', 'two:b.txt', 'three:c.txt'):
+        (folder / name).write_text(name)
+    plan = build_rename_plan([issue(folder / name) for name in ('one:a.txt', 'two:b.txt', 'three:c.txt')]
+                             + [issue(folder)], fix_name)
+    (folder / 'two:b.txt').unlink()
+    (folder / 'three_c.txt').write_text('taken')
+
+    result = apply_plan(plan, dry_run=True)
+
+    assert result.dry_run
+    assert result.renamed == 2  # one:a.txt and the folder, after its children
+    assert sorted(error.split(':')[0] for _, error in result.failed) == ['Source does not exist', 'Target already exists']
+    assert sorted(os.listdir(share)) == ['bad:folder']
+    assert check_plan(plan) == result
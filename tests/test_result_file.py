@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+from result_file import ResultFileReader, ResultFileWriter, write_result_file
+
+
+def record(i):
+    return {'name': f'bad\udcff{i}.txt', 'path': f'/share/bad\udcff{i}.txt',
+            'issue': 'Name contains bytes that are not valid UTF-8', 'suggested_fix': 'Rename'}
+
+
+def test_round_trip_with_undecodable_names(tmp_path):
+    filename = str(tmp_path / 'scan.spr')
+    records = [record(i) for i in range(10000)]
+
+    assert write_result_file(records, filename, total_files=20000, compliant_files=10000, directory='/share') == 10000
+
+    reader = ResultFileReader(filename)
+    try:
+        assert len(reader) == 10000
+        assert reader[0] == records[0]
+        assert reader[-1] == records[-1]
+        assert list(reader) == records
+        assert (reader.total_files, reader.compliant_files, reader.directory) == (20000, 10000, '/share')
+    finally:
+        reader.close()
+
+
+def test_few_records_become_visible_after_the_commit_interval(tmp_path):
+    filename = str(tmp_path / 'scan.spr')
+    writer = ResultFileWriter(filename, '/share', commit_interval=0.05)
+    reader = ResultFileReader(filename)
+    try:
+        for i in range(3):
+            writer.append(record(i))
+        deadline = time.monotonic() + 5
+        while len(reader) < 3 and time.monotonic() < deadline:
+            time.sleep(0.02)
+            reader.refresh()
+        assert len(reader) == 3
+        assert reader[2] == record(2)
+    finally:
+        writer.close()
+        reader.close()
+
+
+def test_without_interval_records_wait_for_a_commit(tmp_path):
+    filename = str(tmp_path / 'scan.spr')
+    with ResultFileWriter(filename, commit_interval=None) as writer:
+        writer.append(record(0))
+        time.sleep(0.1)
+        reader = ResultFileReader(filename)
+        assert len(reader) == 0
+        writer.commit()
+        reader.refresh()
+        assert len(reader) == 1
+        reader.close()
+
+
+def test_reading_a_closed_reader_raises_value_error(tmp_path):
+    filename = str(tmp_path / 'scan.spr')
+    write_result_file([record(i) for i in range(3)], filename)
+    reader = ResultFileReader(filename)
+    rows = iter(reader)
+    next(rows)
+    reader.close()
+
+    with pytest.raises(ValueError, match='closed'):
+        reader[1]
+    with pytest.raises(ValueError, match='closed'):
+        next(rows)
+    with pytest.raises(ValueError, match='closed'):
+        reader.refresh()
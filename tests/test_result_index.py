@@ -0,0 +1,42 @@
+import pytest
+
+from result_index import ResultIndex, tokenize
+from result_store import ResultBuffer
+
+
+def record(path, issue='Contains invalid characters'):
+    return {'name': path.rsplit('/', 1)[-1], 'path': path, 'issue': issue, 'suggested_fix': ''}
+
+
+def test_tokenize_splits_on_underscores():
+    assert tokenize('/Share/Q3_budget_final.xlsx') == ['share', 'q3', 'budget', 'final', 'xlsx']
+    assert tokenize('report_12345.pdf') == ['report', '12345', 'pdf']
+
+
+def test_search_finds_words_inside_underscored_names():
+    rows = [record('/share/Q3_budget_final.xlsx'), record('/share/report_12345.pdf'), record('/share/notes.txt')]
+    index = ResultIndex(rows)
+
+    assert index.search('budget') == {0}
+    assert index.search('fin') == {0}
+    assert index.search('12345') == {1}
+    assert index.search('') is None
+
+
+@pytest.mark.parametrize('run_size', [1, 3, 7, 1000])
+def test_sorting_in_spilled_runs_matches_in_memory_sort(run_size):
+    rows = [record(f'/share/{name}', issue) for name, issue in [
+        ('b.txt', 'z'), ('A.txt', 'y'), ('c.txt', 'z'), ('a.txt', 'x'), ('bad\udcff.txt', 'y'), ('d.txt', 'z'),
+    ]]
+    buffer = ResultBuffer(memory_limit=1)
+    buffer.extend(rows)
+    index = ResultIndex(buffer, run_size=run_size)
+
+    for field in ('name', 'path', 'issue'):
+        expected = sorted(range(len(rows)), key=lambda i: rows[i][field].casefold())
+        assert list(index.permutations[field]) == expected
+        assert [index.ranks[field][i] for i in expected] == list(range(len(rows)))
+
+    view = index.view('txt', 'issue', reverse=True)
+    assert [row['issue'] for row in view] == ['z', 'z', 'z', 'y', 'y', 'x']
+    buffer.close()
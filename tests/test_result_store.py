@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from result_store import MemoryBudget, ResultBuffer
+
+
+def record(i):
+    return {'name': f'f{i}', 'path': f'/share/f{i}\udcff', 'issue': 'issue', 'suggested_fix': 'fix'}
+
+
+def test_spilled_buffer_keeps_order_and_random_access():
+    buffer = ResultBuffer(memory_limit=5000)
+    buffer.extend(record(i) for i in range(1000))
+
+    assert buffer.spilled
+    assert len(buffer) == 1000
+    assert list(buffer) == [record(i) for i in range(1000)]
+    assert buffer[0] == record(0)
+    assert buffer[-1] == record(999)
+    assert buffer[517] == record(517)
+    buffer.close()
+
+
+@pytest.mark.skipif(not os.path.isdir('/proc/self/fd'), reason="needs /proc to count open files")
+def test_many_spills_use_one_file_handle():
+    open_before = len(os.listdir('/proc/self/fd'))
+    buffer = ResultBuffer(memory_limit=1)
+    buffer.extend(record(i) for i in range(3000))
+    for i in range(0, 3000, 7):
+        assert buffer[i] == record(i)
+
+    assert len(os.listdir('/proc/self/fd')) <= open_before + 1
+    buffer.close()
+
+
+def test_shared_budget_bounds_all_buffers():
+    budget = MemoryBudget(20000)
+    buffers = [ResultBuffer(budget=budget) for _ in range(4)]
+    for i in range(500):
+        for buffer in buffers:
+            buffer.append(record(i))
+        assert budget.used <= budget.limit
+
+    assert all(len(buffer) == 500 for buffer in buffers)
+    assert list(buffers[2]) == [record(i) for i in range(500)]
+    for buffer in buffers:
+        buffer.close()
+    assert budget.used == 0
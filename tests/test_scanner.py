@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from scanner import SharePointScanner
+
+
+@pytest.mark.skipif(os.name == 'nt' or not hasattr(os, 'link'), reason="needs hard links and ':' in names")
+def test_hard_linked_duplicate_is_checked_but_counted_once(tmp_path):
+    (tmp_path / 'a.txt').write_text('x')
+    (tmp_path / 'b').mkdir()
+    os.link(tmp_path / 'a.txt', tmp_path / 'b' / 'bad:name.exe')
+
+    scanner = SharePointScanner()
+    issues = list(scanner.scan_directory(str(tmp_path)))
+
+    assert scanner.total_files == 1
+    assert scanner.compliant_files == 1
+    assert [issue['name'] for issue in issues] == ['bad:name.exe']
+    assert 'Contains invalid characters' in issues[0]['issue']
+    assert 'Unsupported file type (.exe)' in issues[0]['issue']
+    assert [link['issue'] for link in scanner.link_issues] == ["Content already scanned through another path"]
+
+
+@pytest.mark.skipif(not hasattr(os, 'symlink') or os.name == 'nt', reason="needs symbolic links")
+def test_followed_links_are_reported_instead_of_their_targets(tmp_path):
+    (tmp_path / 'keep').mkdir()
+    (tmp_path / 'keep' / 'doc.txt').write_text('x')
+    (tmp_path / 'file.txt').write_text('y')
+    # Several names, so some links sort before and some after their targets
+    for name in ('a-link', 'keeplink', 'z-link'):
+        os.symlink(tmp_path / 'keep', tmp_path / name)
+        os.symlink(tmp_path / 'file.txt', tmp_path / f'{name}.txt')
+
+    scanner = SharePointScanner()
+    scanner.set_link_policy('follow')
+    scanner.scan_directory(str(tmp_path))
+
+    reported = sorted(os.path.basename(link['path']) for link in scanner.link_issues)
+    assert reported == ['a-link', 'a-link.txt', 'keeplink', 'keeplink.txt', 'z-link', 'z-link.txt']
+    assert scanner.total_files == 2
+
+
+@pytest.mark.skipif(not hasattr(os, 'symlink') or os.name == 'nt', reason="needs symbolic links")
+def test_directory_symlink_loop_ends_under_follow_policy(tmp_path):
+    (tmp_path / 'a' / 'b').mkdir(parents=True)
+    (tmp_path / 'a' / 'b' / 'doc.txt').write_text('x')
+    os.symlink(tmp_path / 'a', tmp_path / 'a' / 'b' / 'back-to-a')
+    os.symlink(tmp_path, tmp_path / 'a' / 'root-loop')
+
+    scanner = SharePointScanner()
+    scanner.set_link_policy('follow')
+    scanner.scan_directory(str(tmp_path))
+
+    assert scanner.total_files == 1
+    loops = sorted(
+        os.path.basename(link['path']) for link in scanner.link_issues
+        if link['issue'].startswith("Folder already scanned")
+    )
+    assert loops == ['back-to-a', 'root-loop']
+
+
+def test_excluded_folders_are_never_listed(tmp_path, monkeypatch):
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'app.js').write_text('x')
+    (tmp_path / 'src' / 'node_modules' / 'pkg').mkdir(parents=True)
+    (tmp_path / 'src' / 'node_modules' / 'pkg' / 'index.mjs').write_text('x')
+    (tmp_path / 'notes.bak').write_text('x')
+
+    listed = []
+    scandir = os.scandir
+
+    def recording_scandir(path):
+        listed.append(os.fspath(path))
+        return scandir(path)
+
+    monkeypatch.setattr(os, 'scandir', recording_scandir)
+    scanner = SharePointScanner()
+    scanner.set_exclusions(['node_modules', '*.bak'])
+    issues = list(scanner.scan_directory(str(tmp_path)))
+
+    # Both passes list the root and src, and nothing below node_modules
+    assert sorted(listed) == sorted([str(tmp_path), str(tmp_path / 'src')] * 2)
+    assert scanner.excluded_dirs == 1
+    assert scanner.excluded_files == 1
+    assert sorted((item['name'], item['issue']) for item in scanner.excluded) == [
+        ('node_modules', "Excluded folder (contents not scanned)"),
+        ('notes.bak', "Excluded file"),
+    ]
+    assert scanner.found_extensions == {'.js'}
+    assert scanner.total_files == 1
+    assert not any('node_modules' in issue['path'] for issue in issues)
@@ -0,0 +1,42 @@
+import io
+
+from result_store import REPORT_ERRORS
+from snapshot import diff_snapshots, read_snapshot, write_diff, write_snapshot
+
+
+def record(path, issue):
+    return {'name': path.rsplit('/', 1)[-1], 'path': path, 'issue': issue, 'suggested_fix': ''}
+
+
+def test_snapshot_round_trips_undecodable_paths(tmp_path):
+    records = [
+        record('/share/z.txt', 'Contains invalid characters'),
+        record('/share/bad\udcff.txt', 'Name contains bytes that are not valid UTF-8'),
+        record('/share/half\ud800.txt', 'Name contains unpaired UTF-16 surrogates'),
+    ]
+    filename = str(tmp_path / 'one.spsnap')
+
+    # A run size of one forces every record through a spilled run
+    assert write_snapshot(records, filename, run_size=1) == 3
+
+    assert list(read_snapshot(filename)) == sorted(records, key=lambda r: r['path'])
+
+
+def test_diff_matches_undecodable_paths(tmp_path):
+    old = str(tmp_path / 'old.spsnap')
+    new = str(tmp_path / 'new.spsnap')
+    write_snapshot([record('/share/bad\udcff.txt', 'old issue'), record('/share/gone.txt', 'x')], old, run_size=1)
+    write_snapshot([record('/share/bad\udcff.txt', 'new issue'), record('/share/new.txt', 'y')], new, run_size=1)
+
+    changes = {change['path']: change['change'] for change in diff_snapshots(old, new)}
+    assert changes == {
+        '/share/bad\udcff.txt': 'changed',
+        '/share/gone.txt': 'removed',
+        '/share/new.txt': 'added',
+    }
+
+    out = io.TextIOWrapper(io.BytesIO(), encoding='utf-8', errors=REPORT_ERRORS, newline='')
+    counts = write_diff(diff_snapshots(old, new), out)
+    out.flush()
+    assert counts == {'added': 1, 'removed': 1, 'changed': 1}
+    assert b'bad\\udcff.txt' in out.buffer.getvalue()